@@ -1,18 +1,90 @@
 from skrutable.scansion import Scanner as Sc
 from skrutable.scansion import scansion_syllable_separator
 from skrutable.scansion import Verse
+from skrutable.scansion import gaRa_abbreviation
 from skrutable import meter_patterns
 from skrutable.transliteration import Transliterator as Tr
 from skrutable.config import load_config_dict_from_json_file
 import re
+import time
+import numpy as np
 from copy import copy
+import heapq
+from collections import OrderedDict
+from itertools import product
+from multiprocessing import Pool
 
 # load config variables
 config = load_config_dict_from_json_file()
 default_resplit_option = config["default_resplit_option"]  # e.g. "none"
 default_resplit_keep_midpoint = config["default_resplit_keep_midpoint"]  # e.g. True
+resplit_candidates_kept = config["resplit_candidates_kept"] # e.g. 10
 disable_non_trizwuB_upajAti = config["disable_non_trizwuB_upajAti"] # e.g. True
 meter_scores = config["meter_scores"] # dict
+identification_memo_size = config["identification_memo_size"] # e.g. 100000
+
+# order for resplit_option 'auto', cheapest first
+# (resplit_fast gives same result as resplit_max)
+resplit_cascade = ['none', 'resplit_lite', 'resplit_fast']
+
+class IdentificationMemo(object):
+	"""
+	Internal size-bounded memo of identification results, least recently used dropped first.
+
+	Results depend only on syllable weights (morae and gaṇas follow from them)
+	and on relevant config values, which together make the key.
+
+	Shared by VerseTester objects of a single MeterIdentifier,
+	i.e., across calls to identify_meter() and across resplit candidates.
+	"""
+
+	def __init__(self, maxsize=identification_memo_size):
+		self.maxsize = maxsize # int
+		self.results = OrderedDict() # e.g. {(weights, config key): (label, score, success)}
+		self.hits = 0 # int
+		self.misses = 0 # int
+
+	def get(self, key):
+		"""Returns stored result for key (as most recently used) or None."""
+		try:
+			result = self.results[key]
+		except KeyError:
+			self.misses += 1
+			return None
+		self.results.move_to_end(key)
+		self.hits += 1
+		return result
+
+	def put(self, key, result):
+		self.results[key] = result
+		if len(self.results) > self.maxsize:
+			self.results.popitem(last=False)
+
+	def clear(self):
+		self.results.clear()
+		self.hits = self.misses = 0
+
+	def stats(self):
+		"""Returns dict with hits, misses, hit_rate, size, and maxsize."""
+		lookups = self.hits + self.misses
+		return {
+			'hits' : self.hits,
+			'misses' : self.misses,
+			'hit_rate' : self.hits / lookups if lookups else 0.0,
+			'size' : len(self.results),
+			'maxsize' : self.maxsize,
+			}
+
+
+def identification_config_key():
+	"""
+	Internal function.
+
+	Returns summary of config values affecting identification results,
+	as string (since hashed only once).
+	"""
+	return repr( ( sorted(meter_scores.items()), disable_non_trizwuB_upajAti ) )
+
 
 class VerseTester(object):
 	"""
@@ -31,6 +103,16 @@ class VerseTester(object):
 		self.resplit_option = default_resplit_option # string
 		self.resplit_keep_midpoint = default_resplit_keep_midpoint # bool
 		self.identification_attempt_count = 0
+		self.max_candidates = None # int, or None for no limit on identification attempts
+		self.deadline = None # float (from time.perf_counter()), or None for no time limit
+		self.budget_exceeded = False # bool
+		self.Scanner = Sc() # for weights-related helpers
+		# results by pāda weights, reused across resplits of same Verse
+		self.anuzwuB_half_labels = {} # e.g. {('glgglggg', 'glgglglg'): 'pathyā'}
+		self.samavftta_pAda_labels = {} # e.g. {'ggllglgllgg': 'indravajrā [11: ttjgg]'}
+		# results by whole Verse weights, optionally shared (e.g. by MeterIdentifier)
+		self.identification_memo = None # IdentificationMemo, or None for no memo
+		self.identification_config_key = identification_config_key() # string
 
 	def combine_results(self, Vrs, new_label, new_score):
 		old_label = Vrs.meter_label or ''
@@ -61,6 +143,27 @@ class VerseTester(object):
 				vipulā (4.5 subtypes: na, ra, ma, bha, and variant bha).
 		Returns string result if match found, None otherwise.
 
+		Usual case of two 8-syllable pādas is looked up in anuzwuB_half_table,
+		anything else tested with regexes.
+		"""
+		if len(odd_pAda_weights) == len(even_pAda_weights) == 8:
+			packed_weights = self.Scanner.pack_syllable_weights(
+				odd_pAda_weights + even_pAda_weights
+				)
+			if packed_weights != None:
+				return anuzwuB_half_table[packed_weights]
+
+		pAda_weights = (odd_pAda_weights, even_pAda_weights)
+		if pAda_weights not in self.anuzwuB_half_labels:
+			self.anuzwuB_half_labels[pAda_weights] = self.test_as_anuzwuB_half_by_regex(
+				odd_pAda_weights, even_pAda_weights
+				)
+		return self.anuzwuB_half_labels[pAda_weights]
+
+	def test_as_anuzwuB_half_by_regex(self, odd_pAda_weights, even_pAda_weights):
+		"""
+		Same as test_as_anuzwuB_half(),
+		but always tests directly with regexes of meter_patterns.anuzwuB_pAda.
 		"""
 		# check even pāda
 		regex = re.compile(meter_patterns.anuzwuB_pAda['even'])
@@ -86,7 +189,7 @@ class VerseTester(object):
 		Returns 1 if anuṣṭubh, or 0 if not.
 		"""
 
-		w_p = Vrs.syllable_weights.split('\n')  # weights by pāda
+		w_p = Vrs.weights_by_pAda  # weights by pāda
 
 		# make sure full four pādas
 		try: w_p[3]
@@ -140,7 +243,7 @@ class VerseTester(object):
 		self.pAdasamatva_count = 0
 
 		# prepare weights-by-pāda for samatva count: omit last anceps syllable
-		wbp = [true_wbp[:-1] for true_wbp in Vrs.syllable_weights.split('\n')]
+		wbp = [true_wbp[:-1] for true_wbp in Vrs.weights_by_pAda]
 
 		# make sure full four pādas
 		try: wbp[3]
@@ -158,10 +261,36 @@ class VerseTester(object):
 			self.pAdasamatva_count = max_match
 
 
+	def label_samavftta_pAda(self, pAda_weights, pAda_gaRas):
+		"""
+		Accepts weights and gaṇa abbreviation of single pāda.
+		Returns label of matching known samavṛtta (e.g. 'indravajrā [11: ttjgg]'),
+		or None if none known.
+		"""
+
+		if pAda_weights not in self.samavftta_pAda_labels:
+
+			# look for exact match among patterns with same length
+			gaRa_pattern = meter_patterns.samavftta_gaRa_index[len(pAda_weights)].get(pAda_gaRas)
+
+			if gaRa_pattern != None:
+				meter_label = meter_patterns.samavfttas_by_family_and_gaRa[len(pAda_weights)][gaRa_pattern]
+				meter_label += ' [%d: %s]' % (
+				len(pAda_weights),
+				meter_patterns.choose_heavy_gaRa_pattern(gaRa_pattern)
+				)
+			else:
+				meter_label = None
+
+			self.samavftta_pAda_labels[pAda_weights] = meter_label
+
+		return self.samavftta_pAda_labels[pAda_weights]
+
+
 	def evaluate_samavftta(self, Vrs):
 		# sufficient pAdasamatva already assured, now just evaluate
 
-		wbp = Vrs.syllable_weights.split('\n') # weights by pāda
+		wbp = Vrs.weights_by_pAda # weights by pāda
 
 		# get index of most frequent pāda type
 		wbp_sans_final = [ w[:-1] for w in wbp ] # omit final anceps from consideration
@@ -169,23 +298,11 @@ class VerseTester(object):
 		i = wbp_sans_final.index(most_freq_pAda)
 
 		w_to_id = wbp[i] # weights to id, including final anceps
-		g_to_id = Vrs.gaRa_abbreviations.split('\n')[i] # gaRa abbreviation to id
-
-		# look for match among regexes with same length
-		for gaRa_pattern in meter_patterns.samavfttas_by_family_and_gaRa[len(w_to_id)].keys():
-
-			regex = re.compile(gaRa_pattern)
+		g_to_id = Vrs.gaRas_by_pAda[i] # gaRa abbreviation to id
 
-			if re.match(regex, g_to_id):
+		meter_label = self.label_samavftta_pAda(w_to_id, g_to_id)
 
-				meter_label = meter_patterns.samavfttas_by_family_and_gaRa[len(w_to_id)][gaRa_pattern]
-				meter_label += ' [%d: %s]' % (
-				len(w_to_id),
-				meter_patterns.choose_heavy_gaRa_pattern(gaRa_pattern)
-				)
-				break
-
-		else:
+		if meter_label == None:
 			meter_label = "ajñātasamavṛtta" # i.e., might need to add to meter_patterns
 			meter_label += ' [%d: %s]' % ( len(w_to_id), g_to_id )
 
@@ -211,28 +328,26 @@ class VerseTester(object):
 		# sufficient pAdasamatva already assured, now just evaluate
 		Vrs.identification_score = meter_scores["ardhasamavṛtta, perfect"]
 
-		wbp = Vrs.syllable_weights.split('\n') # weights by pāda
+		wbp = Vrs.weights_by_pAda # weights by pāda
 
-		gs_to_id = Vrs.gaRa_abbreviations.split('\n') # gaRa abbreviation to id
+		gs_to_id = Vrs.gaRas_by_pAda # gaRa abbreviation to id
 		odd_g_to_id = gs_to_id[0]
 		even_g_to_id = gs_to_id[1]
 
-		# look for match among regexes with same length
-		iterator = meter_patterns.ardhasamavftta_by_odd_even_regex_tuple.keys()
-		for (odd_gaRa_pattern, even_gaRa_pattern) in iterator:
+		# look for exact match of any relevant prefixes, keep highest-priority one
+		odd_lens, even_lens = meter_patterns.ardhasamavftta_gaRa_lens
+		matches = [
+			meter_patterns.ardhasamavftta_gaRa_index[ (odd_g_to_id[:i], even_g_to_id[:j]) ]
+			for i in odd_lens for j in even_lens
+			if (odd_g_to_id[:i], even_g_to_id[:j]) in meter_patterns.ardhasamavftta_gaRa_index
+			]
 
-			regex_odd = re.compile(odd_gaRa_pattern)
-			regex_even = re.compile(even_gaRa_pattern)
+		if matches != []:
 
-			if 	(
-				re.match(regex_odd, odd_g_to_id) and
-				re.match(regex_even, even_g_to_id)
-				):
-
-				meter_label = meter_patterns.ardhasamavftta_by_odd_even_regex_tuple[
-					(odd_gaRa_pattern, even_gaRa_pattern)
-				]
-				break
+			priority, odd_even_regex_tuple = min(matches)
+			meter_label = meter_patterns.ardhasamavftta_by_odd_even_regex_tuple[
+				odd_even_regex_tuple
+			]
 
 		else:
 			meter_label = "ajñātārdhasamavṛtta" # i.e., might need to add to meter_patterns
@@ -245,9 +360,9 @@ class VerseTester(object):
 	def evaluate_upajAti(self, Vrs):
 		# sufficient length similarity already assured, now just evaluate
 
-		wbp = Vrs.syllable_weights.split('\n') # weights by pāda
+		wbp = list(Vrs.weights_by_pAda) # weights by pāda, own copy (modified below)
 		wbp_lens = [ len(line) for line in wbp ]
-		gs_to_id = Vrs.gaRa_abbreviations.split('\n')
+		gs_to_id = list(Vrs.gaRas_by_pAda)
 
 		# special exception for triṣṭubh-jagatī mix
 		# see Karashima 2016 "The Triṣṭubh-Jagatī Verses in the Saddharmapuṇḍarīka"
@@ -294,20 +409,9 @@ class VerseTester(object):
 		meter_labels = []
 		for i, g_to_id in enumerate(gs_to_id):
 
-			for gaRa_pattern in meter_patterns.samavfttas_by_family_and_gaRa[wbp_lens[i]].keys():
-
-				regex = re.compile(gaRa_pattern)
-
-				if re.match(regex, g_to_id):
-
-					meter_label = meter_patterns.samavfttas_by_family_and_gaRa[wbp_lens[i]][gaRa_pattern]
-					meter_label += ' [%d: %s]' % (
-					wbp_lens[i],
-					meter_patterns.choose_heavy_gaRa_pattern(gaRa_pattern)
-					)
-					break
+			meter_label = self.label_samavftta_pAda(wbp[i], g_to_id)
 
-			else:
+			if meter_label == None:
 				meter_label = "ajñātam" # i.e., might need to add to meter_patterns
 				meter_label += ' [%d: %s]' % ( wbp_lens[i], g_to_id )
 
@@ -355,7 +459,7 @@ class VerseTester(object):
 
 	def is_vizamavftta(self, Vrs):
 
-		gs_to_id = Vrs.gaRa_abbreviations.split('\n')
+		gs_to_id = Vrs.gaRas_by_pAda
 
 		for (a, b, c, d) in meter_patterns.vizamavftta_by_4_tuple:
 			if (gs_to_id[0],gs_to_id[1],gs_to_id[2],gs_to_id[3]) == (a, b, c, d):
@@ -368,7 +472,7 @@ class VerseTester(object):
 
 	def test_as_samavftta_etc(self, Vrs):
 
-		wbp = Vrs.syllable_weights.split('\n') # weights by pāda
+		wbp = Vrs.weights_by_pAda # weights by pāda
 		wbp_lens = [ len(line) for line in wbp ]
 
 		# make sure full four pādas
@@ -444,13 +548,17 @@ class VerseTester(object):
 		Returns string detailing results if identified as such, or None if not.
 		"""
 
-		w_p = Vrs.syllable_weights.split('\n')
+		w_p = Vrs.weights_by_pAda
 		# make sure full four pādas
 		try: w_p[3]
 		except IndexError: return 0
 
 		morae_by_pAda = Vrs.morae_per_line
 
+		# quick exit if no jāti could possibly match (see jAti_morae_by_pAda)
+		if tuple(morae_by_pAda[:4]) not in jAti_morae_by_pAda:
+			return 0
+
 		# Note: self.morae_by_pAda is a list of numbers,
 		# here manipulate as such but also as a single string
 		morae_by_pAda_string = str(morae_by_pAda)
@@ -495,6 +603,78 @@ class VerseTester(object):
 		else:  # if all patterns tested and nothing returned
 			return 0
 
+	def estimate_max_scores(self, pAda_lens, morae_by_pAda):
+		"""
+		Accepts two integer arrays of shape (number of Verses, 4):
+		lengths (in syllables) and morae of each of four pādas.
+
+		Returns integer array with, for each Verse, upper bound on identification_score
+		that attempt_identification() could assign to any Verse with pādas
+		of these lengths and morae, or 0 if it could not succeed at all.
+
+		Must be kept in sync with conditions for scores in methods above.
+		"""
+
+		l_a, l_b, l_c, l_d = pAda_lens.T
+
+		could_be_max = (
+			# anuṣṭubh, either full or half
+			(l_a == 8) & (l_b == 8) & (l_c == 8) & (l_d == 8)
+			| (l_a + l_b == 8) & (l_c + l_d == 8)
+			# perfect samavṛtta
+			| (l_a == l_b) & (l_b == l_c) & (l_c == l_d) & (l_a > 1)
+			# perfect viṣamavṛtta
+			| is_in_packed(pack_pAda_counts(pAda_lens), vizamavftta_pAda_lens)
+			)
+
+		could_be_8 = (
+			# perfect ardhasamavṛtta
+			(l_a == l_c) & (l_b == l_d)
+			# perfect jāti
+			| is_in_packed(pack_pAda_counts(morae_by_pAda), jAti_morae_by_pAda_packed)
+			)
+
+		# anuṣṭubh with single perfect half also needs two 8s
+		# samavṛtta and upajāti, even imperfect, need some length in common
+		could_be_any = (
+			(l_a == l_b) | (l_a == l_c) | (l_a == l_d) | (l_b == l_c) | (l_b == l_d) | (l_c == l_d)
+			)
+
+		return np.select(
+			[could_be_max, could_be_8, could_be_any],
+			[
+				meter_scores["max score"],
+				max( meter_scores["ardhasamavṛtta, perfect"], meter_scores["jāti, perfect"] ),
+				max( meter_scores["anuṣṭubh, full, one half perfect, one imperfect)"],
+					meter_scores["upajāti, perfect"],
+					meter_scores["samavṛtta, imperfect (3)"],
+					meter_scores["ardhasamavṛtta, perfect, unknown"],
+					meter_scores["upajāti, imperfect"],
+					)
+			],
+			default=0
+			)
+
+	def has_budget(self):
+		"""Returns True if either max_candidates or deadline is set, False otherwise."""
+		return self.max_candidates != None or self.deadline != None
+
+	def within_budget(self):
+		"""
+		Returns True if max_candidates and deadline allow for another identification attempt.
+		Otherwise returns False and sets budget_exceeded.
+		"""
+		if (
+			self.max_candidates != None
+			and self.identification_attempt_count >= self.max_candidates
+			) or (
+			self.deadline != None
+			and time.perf_counter() >= self.deadline
+			):
+			self.budget_exceeded = True
+			return False
+		return True
+
 	def attempt_identification(self, Vrs):
 		"""
 		Receives static, populated Verse object on which to attempt identification.
@@ -524,10 +704,34 @@ class VerseTester(object):
 		Embeds identification results as Verse.meter_label and Verse.identification_score.
 		Returns string corresponding to Verse.meter_label. - currently
 		Returns int result 1 if successul and 0 if not. - planned
+
+		If identification_memo set, looks up and stores results there,
+		as long as Verse has no previous result to combine with.
 		"""
 
 		self.identification_attempt_count += 1
 
+		if (
+			self.identification_memo == None
+			or Vrs.meter_label != None or Vrs.identification_score != 0
+			):
+			return self.attempt_identification_by_tests(Vrs)
+
+		memo_key = (tuple(Vrs.weights_by_pAda), self.identification_config_key)
+		result = self.identification_memo.get(memo_key)
+		if result == None:
+			success = self.attempt_identification_by_tests(Vrs)
+			self.identification_memo.put(
+				memo_key, (Vrs.meter_label, Vrs.identification_score, success) )
+		else:
+			Vrs.meter_label, Vrs.identification_score, success = result
+		return success
+
+	def attempt_identification_by_tests(self, Vrs):
+		"""
+		Internal method for attempt_identification(), runs actual tests (see there).
+		"""
+
 		# anuzwuB
 
 		success_anuzwuB = self.test_as_anuzwuB(Vrs) # 1 if successful, 0 if not
@@ -553,6 +757,127 @@ class VerseTester(object):
 			return 0
 
 
+def build_anuzwuB_half_table():
+	"""
+	Internal function.
+
+	Returns list of length 2^16 mapping every pair of 8-syllable odd and even pādas,
+	bit-packed as with scansion.Scanner.pack_syllable_weights(odd + even),
+	to anuṣṭubh label (or None) according to meter_patterns.anuzwuB_pAda,
+	i.e., to same result as VerseTester.test_as_anuzwuB_half_by_regex().
+
+	Since even and odd pādas are tested independently,
+	only needs to test each of 2^8 weight patterns once as each.
+	"""
+	weights_by_bits = [ format(bits, '08b').translate(bits_to_weights) for bits in range(2**8) ]
+
+	regex = re.compile(meter_patterns.anuzwuB_pAda['even'])
+	valid_evens = [ re.match(regex, weights) != None for weights in weights_by_bits ]
+
+	odd_labels = []
+	for weights in weights_by_bits:
+		for weights_pattern in meter_patterns.anuzwuB_pAda['odd'].keys():
+			regex = re.compile(weights_pattern)
+			if re.match(regex, weights):
+				odd_labels.append(meter_patterns.anuzwuB_pAda['odd'][weights_pattern])
+				break
+		else:
+			odd_labels.append(None)
+
+	return [
+		odd_labels[packed_weights >> 8] if valid_evens[packed_weights & 0xFF] else None
+		for packed_weights in range(2**16)
+		]
+
+def pack_pAda_counts(counts_by_pAda):
+	"""
+	Internal function.
+
+	Accepts integer array of shape (number of Verses, 4), e.g. of lengths or morae by pāda.
+
+	Returns integer array with one number per Verse (i.e., row),
+	byte-packed so as to allow quick comparison of rows by np.isin().
+	Counts of 255 or more are all treated as equal (never occur in any known meter).
+	"""
+	counts_by_pAda = np.asarray(counts_by_pAda, dtype=np.int64).reshape(-1, 4).clip(0, 255)
+	return (counts_by_pAda << np.array([24, 16, 8, 0])).sum(axis=1)
+
+def is_in_packed(packed_counts, known_packed_counts):
+	"""
+	Internal function.
+
+	Like np.isin(packed_counts, known_packed_counts), but faster for small sorted known_packed_counts.
+	"""
+	i = np.searchsorted(known_packed_counts, packed_counts).clip(0, len(known_packed_counts) - 1)
+	return known_packed_counts[i] == packed_counts
+
+# packed from e.g. (10, 10, 11, 13) for udgatā, used in VerseTester.estimate_max_scores()
+vizamavftta_pAda_lens = np.unique(pack_pAda_counts([
+	[
+		sum( 3 if gaRa in meter_patterns.gaRas_by_weights.values() else 1 for gaRa in gaRas )
+		for gaRas in gaRas_by_pAda
+		]
+	for gaRas_by_pAda in meter_patterns.vizamavftta_by_4_tuple.keys()
+	]))
+
+# e.g. (12, 17, 11, 15) for āryā, used in VerseTester.test_as_jAti()
+# perfect jāti only allows each pāda one mora less than standard, see test_as_jAti()
+jAti_morae_by_pAda = set(
+	morae_by_pAda
+	for flex_pattern, std_pattern, jAti_name in meter_patterns.jAtis_by_morae
+	for morae_by_pAda in product( *[ (morae, morae - 1) for morae in std_pattern ] )
+	if re.match(flex_pattern, str(list(morae_by_pAda)))
+	)
+# same packed, used in VerseTester.estimate_max_scores()
+jAti_morae_by_pAda_packed = np.unique(pack_pAda_counts(list(jAti_morae_by_pAda)))
+
+bits_to_weights = str.maketrans('01', 'lg')
+anuzwuB_half_table = build_anuzwuB_half_table() # e.g. anuzwuB_half_table[0b0110001001000100] == 'pathyā'
+
+
+class ResplitCandidate(object):
+	"""
+	Internal lightweight record for single resplit of Verse.
+
+	Has only those Verse attributes needed by VerseTester.attempt_identification(),
+	plus pāda breaks and order of trial.
+	Ordered by identification_score, then earlier trial.
+
+	Made into full Verse object only if kept as best (see MeterIdentifier.resplit_to_Verse()).
+	"""
+
+	__slots__ = [
+		'pAda_brs_triple', 'trial_index',
+		'weights_by_pAda', 'morae_per_line', 'gaRas_by_pAda',
+		'meter_label', 'identification_score',
+		]
+
+	def __init__(self, pAda_brs_triple, trial_index):
+		self.pAda_brs_triple = pAda_brs_triple # list of three ints
+		self.trial_index = trial_index # int
+		self.weights_by_pAda = None # list of strings
+		self.morae_per_line = None # list of integers
+		self.gaRas_by_pAda = None # list of strings
+		self.meter_label = None # string
+		self.identification_score = 0 # int
+
+	def rank(self):
+		return (self.identification_score, -self.trial_index)
+
+	def __lt__(self, other):
+		return self.rank() < other.rank()
+
+
+def keep_best_candidates(candidates_kept, candidate, k=resplit_candidates_kept):
+	"""
+	Adds candidate to heap (list) of at most k best ResplitCandidates.
+	"""
+	if len(candidates_kept) < k:
+		heapq.heappush(candidates_kept, candidate)
+	else:
+		heapq.heappushpop(candidates_kept, candidate)
+
+
 class MeterIdentifier(object):
 	"""
 	User-facing agent-style object.
@@ -566,7 +891,9 @@ class MeterIdentifier(object):
 	def __init__(self):
 		self.Scanner = None
 		self.VerseTester = None
-		self.Verses_found = []  # list of Verse objects which passed VerseTester
+		self.Verses_found = []  # list of best ResplitCandidates which passed VerseTester, best first
+		self.resplit_data = None # for sharing output of prepare_resplits() across resplit options
+		self.identification_memo = IdentificationMemo() # for sharing results across Verses
 
 	def wiggle_iterator(self, start_pos, part_len, resplit_option):
 		"""
@@ -577,7 +904,7 @@ class MeterIdentifier(object):
 		"""
 
 		iter_list = [start_pos]
-		if resplit_option == 'resplit_max':
+		if resplit_option in ['resplit_max', 'resplit_fast']:
 			distance_multiplier = 0.50 # wiggle as far as 50% of part_len
 		elif resplit_option == 'resplit_lite':
 			distance_multiplier = 0.35 # wiggle as far as 35% of part_len
@@ -598,10 +925,60 @@ class MeterIdentifier(object):
 				+ sss.join(syllable_list[cd_pAda_br:])
 				)
 
-	def wiggle_identify(	self, Vrs, syllable_list,
-							VrsTster,
-							pAda_brs, quarter_len):
-		"""Returns a list for MeterIdentifier.Verses_found"""
+	def resplit_weights(	self, weight_variants, morae_sums,
+							ab_pAda_br, bc_pAda_br, cd_pAda_br, span_memo=None):
+		"""
+		Weights-level equivalent of resplit_Verse().
+
+		Accepts output of Scanner.scan_syllable_weight_variants() for whole syllable list,
+		along with running morae totals (morae_sums[i] == morae of first i syllables within line).
+
+		Optionally accepts dict for reusing results by (start, end) syllable span
+		across resplits of same syllable list.
+
+		Returns tuple of three four-item lists:
+		weights by pāda, morae by pāda, gaṇa abbreviations by pāda.
+		"""
+		if span_memo == None: span_memo = {}
+		weights_within_line, weights_line_final = weight_variants
+		syllable_positions = range(len(weights_within_line)) # slices exactly like syllable list
+
+		pAdas = []
+		for positions in (
+			syllable_positions[:ab_pAda_br],
+			syllable_positions[ab_pAda_br:bc_pAda_br],
+			syllable_positions[bc_pAda_br:cd_pAda_br],
+			syllable_positions[cd_pAda_br:]
+			):
+
+			span = (positions.start, positions.stop)
+			if span not in span_memo:
+
+				if len(positions) == 0:
+					span_memo[span] = ('', 0, '')
+
+				else:
+					start, last = positions.start, positions.stop - 1
+					final_weight = weights_line_final[last]
+					weights = weights_within_line[start:last] + final_weight
+					span_memo[span] = (
+						weights,
+						morae_sums[last] - morae_sums[start] + (2 if final_weight == 'g' else 1),
+						gaRa_abbreviation(weights)
+						)
+
+			pAdas.append(span_memo[span])
+
+		weights_by_pAda, morae_by_pAda, gaRas_by_pAda = [ list(x) for x in zip(*pAdas) ]
+		return weights_by_pAda, morae_by_pAda, gaRas_by_pAda
+
+	def wiggle_positions(self, VrsTster, pAda_brs, quarter_len):
+		"""
+		Returns integer array of shape (number of resplits, 3)
+		with all (ab, bc, cd) pāda break triples to be tried, in order of trial.
+
+		If VerseTester has budget for attempts, orders closest breaks first.
+		"""
 
 		pos_iterators = {}
 		for k in ['ab', 'bc', 'cd']:
@@ -616,56 +993,259 @@ class MeterIdentifier(object):
 					resplit_option=VrsTster.resplit_option
 					)
 
-		wiggle_resplit_output_buffer = ''
-		temp_V = None
-		S = Sc()
-		Verses_found = []
+		pAda_brs_triples = np.stack(
+			np.meshgrid(pos_iterators['ab'], pos_iterators['bc'], pos_iterators['cd'], indexing='ij'),
+			axis=-1
+			).reshape(-1, 3)
 
-		for pos_ab in pos_iterators['ab']:
-			for pos_bc in pos_iterators['bc']:
-				for pos_cd in pos_iterators['cd']:
+		if VrsTster.has_budget():
+			# so that best use is made of limited attempts,
+			# try closest breaks first, i.e., by total distance from initial ones
+			distances = np.abs(pAda_brs_triples - pAda_brs_triples[0]).sum(axis=1)
+			pAda_brs_triples = pAda_brs_triples[np.argsort(distances, kind='stable')]
 
-					try:
+		return pAda_brs_triples
 
-						new_text_syllabified = self.resplit_Verse(
-							syllable_list, pos_ab, pos_bc, pos_cd)
+	def test_resplit(	self, VrsTster,
+						resplit_data, pAda_brs_triple, trial_index):
+		"""
+		Runs VerseTester on single resplit candidate.
 
-						# print()
-						# print(new_text_syllabified)
-						# import pdb; pdb.set_trace()
+		Accepts output of prepare_resplits() as resplit_data.
 
-						temp_V = copy(Vrs)
-						temp_V.text_syllabified = new_text_syllabified
+		Returns tuple of new ResplitCandidate and 1 if successful, 0 if not.
 
-						# print(temp_V.text_syllabified.replace('\n','\t'))
+		May raise IndexError for unusable pāda breaks.
+		"""
 
-						temp_V.syllable_weights = S.scan_syllable_weights(
-							temp_V.text_syllabified)
-						temp_V.morae_per_line = S.count_morae(
-							temp_V.syllable_weights)
-						temp_V.gaRa_abbreviations = '\n'.join(
-						[ S.gaRa_abbreviate(line) for line in temp_V.syllable_weights.split('\n') ]
-						)
+		pos_ab, pos_bc, pos_cd = pAda_brs_triple
 
-						# temp_V.meter_label = VrsTster.attempt_identification(temp_V)
-						success = VrsTster.attempt_identification(temp_V)
+		weight_variants, morae_sums, span_memo = resplit_data
+		weights_by_pAda, morae_by_pAda, gaRas_by_pAda = self.resplit_weights(
+			weight_variants, morae_sums, pos_ab, pos_bc, pos_cd, span_memo)
 
-						if success:
-							Verses_found.append(temp_V)
+		candidate = ResplitCandidate(pAda_brs_triple, trial_index)
+		candidate.weights_by_pAda = weights_by_pAda
+		candidate.morae_per_line = morae_by_pAda
+		candidate.gaRas_by_pAda = gaRas_by_pAda
 
-						if temp_V.identification_score == meter_scores["max score"]:
-							return Verses_found
-							# done when any perfect exemplar found
-							# for greater speed and efficiency
-							# disable for debugging:
-							 	# check whether finding multiple 9s
-								# check whether any temp_V breaks system
+		success = VrsTster.attempt_identification(candidate)
 
+		return candidate, success
 
-					except IndexError:
-						continue
+	def test_first_resplit(self, VrsTster, resplit_data, pAda_brs_triples):
+		"""
+		Runs test_resplit() on first resplit (i.e., closest to initial pāda breaks) alone,
+		since often already perfect, before bounds are estimated for all others.
 
-		return Verses_found
+		Returns same as test_resplit(), or tuple of None and 0 if not testable.
+		"""
+		if len(pAda_brs_triples) == 0 or not VrsTster.within_budget():
+			return None, 0
+		try:
+			return self.test_resplit(
+				VrsTster, resplit_data, pAda_brs_triples[0].tolist(), 0
+				)
+		except IndexError:
+			return None, 0
+
+	def resplit_to_Verse(self, Vrs, syllable_list, candidate):
+		"""
+		Makes full Verse object out of initial Verse and kept ResplitCandidate.
+		"""
+		temp_V = copy(Vrs)
+		temp_V.weights_by_pAda = candidate.weights_by_pAda
+		temp_V.morae_per_line = candidate.morae_per_line
+		temp_V.gaRas_by_pAda = candidate.gaRas_by_pAda
+		temp_V.meter_label = candidate.meter_label
+		temp_V.identification_score = candidate.identification_score
+		temp_V.text_syllabified = self.resplit_Verse(
+			syllable_list, *candidate.pAda_brs_triple)
+		return temp_V
+
+	def prepare_resplits(self, syllable_list):
+		"""
+		Scans weights only once for all resplits of syllable list.
+
+		Returns tuple of arguments for resplit_weights():
+		weight variants, running morae totals, and empty span memo (to be filled).
+
+		Result kept as resplit_data and reused for same syllable list.
+		"""
+		if self.resplit_data != None and self.resplit_data[0] == syllable_list:
+			return self.resplit_data[1]
+
+		weight_variants = Sc().scan_syllable_weight_variants(syllable_list)
+		morae_sums = [0]
+		for weight in weight_variants[0]:
+			morae_sums.append( morae_sums[-1] + (2 if weight == 'g' else 1) )
+		self.resplit_data = (syllable_list, (weight_variants, morae_sums, {}))
+		return self.resplit_data[1]
+
+	def profile_resplits(self, resplit_data, pAda_brs_triples):
+		"""
+		Vectorized equivalent of resplit_weights() for many resplits at once,
+		but only for lengths and morae.
+
+		Accepts output of prepare_resplits() and output of wiggle_positions().
+
+		Returns tuple of two integer arrays of shape (len(pAda_brs_triples), 4):
+		lengths (in syllables) by pāda, morae by pāda.
+		"""
+		(weights_within_line, weights_line_final), morae_sums, span_memo = resplit_data
+		syllable_count = len(weights_within_line)
+
+		# normalize negative and out-of-range pāda breaks, as in slicing
+		pAda_brs = np.asarray(pAda_brs_triples, dtype=np.int64).reshape(-1, 3)
+		pAda_brs = np.where(pAda_brs < 0, pAda_brs + syllable_count, pAda_brs)
+		pAda_brs = pAda_brs.clip(0, syllable_count)
+
+		starts = np.concatenate(
+			[ np.zeros((len(pAda_brs), 1), dtype=np.int64), pAda_brs ], axis=1 )
+		ends = np.concatenate(
+			[ pAda_brs, np.full((len(pAda_brs), 1), syllable_count, dtype=np.int64) ], axis=1 )
+		ends = np.maximum(ends, starts) # i.e., empty pāda
+		pAda_lens = ends - starts
+
+		# morae of all but last syllable as within line, plus last syllable as line-final
+		morae_sums = np.array(morae_sums, dtype=np.int64)
+		final_morae = 1 + (
+			np.frombuffer(weights_line_final.encode('ascii') + b'l', dtype=np.uint8) == ord('g')
+			)
+		last = (ends - 1).clip(0, None)
+		morae_by_pAda = np.where(
+			pAda_lens > 0,
+			morae_sums[last] - morae_sums[starts] + final_morae[last],
+			0
+			)
+
+		return pAda_lens, morae_by_pAda
+
+	def wiggle_identify(	self, syllable_list,
+							VrsTster,
+							pAda_brs, quarter_len):
+		"""
+		Returns a list for MeterIdentifier.Verses_found
+		(best ResplitCandidates, at most resplit_candidates_kept, best first).
+		"""
+
+		candidates_kept = [] # heap, worst first
+
+		# scan weights only once, then just slice for each resplit
+		resplit_data = self.prepare_resplits(syllable_list)
+
+		pAda_brs_triples = self.wiggle_positions(VrsTster, pAda_brs, quarter_len)
+
+		first_candidate, success = self.test_first_resplit(
+			VrsTster, resplit_data, pAda_brs_triples)
+		if success:
+			keep_best_candidates(candidates_kept, first_candidate)
+			if first_candidate.identification_score == meter_scores["max score"]:
+				return [first_candidate]
+
+		# skip resplits which could not succeed at all, judging by lengths and morae alone
+		max_scores = VrsTster.estimate_max_scores(
+			*self.profile_resplits(resplit_data, pAda_brs_triples)
+			)
+		max_scores[:1] = 0 # i.e., first already tested
+
+		for i, (pAda_brs_triple, max_score) in enumerate(
+			zip(pAda_brs_triples.tolist(), max_scores.tolist())
+			):
+
+			if max_score == 0: continue
+
+			if not VrsTster.within_budget(): break
+
+			try:
+
+				candidate, success = self.test_resplit(
+					VrsTster, resplit_data, pAda_brs_triple, i
+					)
+
+				if success:
+					keep_best_candidates(candidates_kept, candidate)
+
+				if candidate.identification_score == meter_scores["max score"]:
+					break
+					# done when any perfect exemplar found
+					# for greater speed and efficiency
+					# disable for debugging:
+					 	# check whether finding multiple 9s
+						# check whether any temp_V breaks system
+
+			except IndexError:
+				continue
+
+		return sorted(candidates_kept, reverse=True)
+
+	def wiggle_identify_fast(	self, syllable_list,
+								VrsTster,
+								pAda_brs, quarter_len):
+		"""
+		Same overall result as wiggle_identify() with same options
+		(i.e., first among best-scoring resplits in order of trial),
+		but only tests resplits that could still do better than best so far.
+
+		Upper bound for each resplit comes cheaply from pāda lengths and morae
+		(see VerseTester.estimate_max_scores()):
+			first, test only those which could get max score, in order of trial
+			if none does, test rest in order of upper bound (then of trial)
+			until nothing left could beat best so far
+
+		Returns a list for MeterIdentifier.Verses_found (at most one ResplitCandidate).
+		"""
+
+		resplit_data = self.prepare_resplits(syllable_list)
+
+		pAda_brs_triples = self.wiggle_positions(VrsTster, pAda_brs, quarter_len)
+
+		best_candidate = None
+		best_rank = (0, 0) # (score, -trial index), higher is better
+
+		first_candidate, success = self.test_first_resplit(
+			VrsTster, resplit_data, pAda_brs_triples)
+		if success:
+			best_candidate = first_candidate
+			best_rank = first_candidate.rank()
+			if first_candidate.identification_score == meter_scores["max score"]:
+				return [first_candidate]
+
+		max_scores = VrsTster.estimate_max_scores(
+			*self.profile_resplits(resplit_data, pAda_brs_triples)
+			)
+		max_scores[:1] = 0 # i.e., first already tested
+
+		# i.e., first those which could get max score, in order of trial
+		# then all others, most promising first, otherwise in order of trial
+		trial_order = np.argsort(-max_scores, kind='stable').tolist()
+		max_scores = max_scores.tolist()
+		pAda_brs_triples = pAda_brs_triples.tolist()
+
+		for i in trial_order:
+
+			if (max_scores[i], -i) <= best_rank:
+				break # neither this nor any remaining could win
+
+			if not VrsTster.within_budget(): break
+
+			try:
+
+				candidate, success = self.test_resplit(
+					VrsTster, resplit_data, pAda_brs_triples[i], i
+					)
+
+				if success and candidate.rank() > best_rank:
+					best_candidate = candidate
+					best_rank = candidate.rank()
+
+			except IndexError:
+				continue
+
+		if best_candidate == None:
+			return []
+		else:
+			return [best_candidate]
 
 
 	def find_meter(self, rw_str, from_scheme=None):
@@ -698,45 +1278,23 @@ class MeterIdentifier(object):
 		return verses_found
 
 
-	def identify_meter(self, rw_str,
-		resplit_option=default_resplit_option,
-		resplit_keep_midpoint=default_resplit_keep_midpoint,
-		from_scheme=None):
+	def identify_scanned_Verse(self, V, resplit_option):
 		"""
-		User-facing method, manages overall identification procedure:
-				accepts raw string
-				sends string to Scanner.scan, receives back scansion.Verse object
-				then, according to segmentation mode
-						makes and passes series of Verse objects to internal VerseTester
-						receives back tested Verses (as internally available dict)
-				returns single Verse object with best identification result
+		Internal method for identify_meter(), run after scansion.
 
-		four segmentation modes:
-				1) none: uses three newlines exactly as provided in input
-				2) resplit_max: discards input newlines, resplits based on overall length
-				3) resplit_lite: initializes length-based resplit with input newlines
-				4) single_pAda: evaluates input as single pAda (verse quarter)
-
-		order
-				first: default or override
-				if fails, then: try other modes in set order (1 2 3; depending on length 4)
+		Accepts populated Verse object and (single) resplit option.
 
+		Returns Verse object with best identification result for that option
+		(either same one or a resplit one).
 		"""
 
-		self.Scanner = S = Sc()
-
-		# gets back mostly populated Verse object
-		V = S.scan(rw_str, from_scheme=from_scheme)
-
-		self.VerseTester = VT = VerseTester()
-		self.VerseTester.resplit_option = resplit_option
-		self.VerseTester.resplit_keep_midpoint = resplit_keep_midpoint
+		VT = self.VerseTester
 
 		if resplit_option == 'none' or V.text_cleaned == '':
 			success = VT.attempt_identification(V)
 			# label and score set internally
 
-		elif resplit_option in ['resplit_max', 'resplit_lite']:
+		elif resplit_option in ['resplit_max', 'resplit_lite', 'resplit_fast']:
 
 			# capture any user-provided pāda breaks (= all newlines after scansion cleaning)
 			newline_indices = [
@@ -772,7 +1330,7 @@ class MeterIdentifier(object):
 						)
 
 				elif	(
-							resplit_option == 'resplit_max' and
+							resplit_option in ['resplit_max', 'resplit_fast'] and
 							self.VerseTester.resplit_keep_midpoint
 						):
 					# full three breaks provided, override second (bc) only, keep other two
@@ -784,7 +1342,7 @@ class MeterIdentifier(object):
 				if 	(
 						resplit_option == 'resplit_lite'
 					) or (
-						resplit_option == 'resplit_max' and
+						resplit_option in ['resplit_max', 'resplit_fast'] and
 						self.VerseTester.resplit_keep_midpoint
 					):
 				# only one break provided, assume bc, override that one, keep other two
@@ -798,20 +1356,146 @@ class MeterIdentifier(object):
 				# could give user some feedback...
 				pass
 
-			# use initial Verse to generate potentially large number of others Verses
-			# store their respective results internally, collect overall list
-			self.Verses_found =	self.wiggle_identify(
-				V, syllable_list, VT,
+			# test potentially large number of resplits as lightweight candidates
+			# keep only best few internally
+			if resplit_option == 'resplit_fast':
+				wiggle_identify = self.wiggle_identify_fast
+			else:
+				wiggle_identify = self.wiggle_identify
+			self.Verses_found =	wiggle_identify(
+				syllable_list, VT,
 				pAda_brs, quarter_len
 				)
 
-			# pick best match, i.e. resulting Verse with highest identification_score
+			# pick best match, i.e. candidate with highest identification_score
 			if len(self.Verses_found) > 0:
-				self.Verses_found.sort(key=lambda x: x.identification_score, reverse=True)
-				V = self.Verses_found[0] # replace initial Verse object
+				# replace initial Verse object
+				V = self.resplit_to_Verse(V, syllable_list, self.Verses_found[0])
+
+		return V
+
+	def identify_meter(self, rw_str,
+		resplit_option=default_resplit_option,
+		resplit_keep_midpoint=default_resplit_keep_midpoint,
+		from_scheme=None,
+		max_candidates=None, time_budget_ms=None,
+		lean=False):
+		"""
+		User-facing method, manages overall identification procedure:
+				accepts raw string
+				sends string to Scanner.scan, receives back scansion.Verse object
+				then, according to segmentation mode
+						makes and passes series of Verse objects to internal VerseTester
+						receives back tested Verses (as internally available dict)
+				returns single Verse object with best identification result
+
+		four segmentation modes:
+				1) none: uses three newlines exactly as provided in input
+				2) resplit_max: discards input newlines, resplits based on overall length
+				3) resplit_lite: initializes length-based resplit with input newlines
+				(also resplit_fast: same result as resplit_max, tries fewer resplits)
+				(also auto: tries none, resplit_lite, resplit_max in turn, until max score)
+				4) single_pAda: evaluates input as single pAda (verse quarter)
+
+		order
+				first: default or override
+				if fails, then: try other modes in set order (1 2 3; depending on length 4)
+
+		optional budget for resplitting (e.g. for predictable response time):
+				max_candidates: max number of resplits to test
+				time_budget_ms: max time in milliseconds (checked before each test)
+				closest resplits then tested first
+				if budget runs out, best result so far returned,
+				with identification_partial set to True
+
+		optional lean (e.g. for bulk runs with identify_meter_many()):
+				intermediate text dropped from returned Verse (see scansion.Verse.make_lean())
+
+		"""
+
+		start_time = time.perf_counter()
+
+		self.Scanner = S = Sc()
+
+		# gets back mostly populated Verse object
+		V = S.scan(rw_str, from_scheme=from_scheme)
+
+		self.resplit_data = None # reset for new Verse
+		self.VerseTester = VT = VerseTester()
+		self.VerseTester.identification_memo = self.identification_memo
+		self.VerseTester.resplit_option = resplit_option
+		self.VerseTester.resplit_keep_midpoint = resplit_keep_midpoint
+		self.VerseTester.max_candidates = max_candidates
+		if time_budget_ms != None:
+			self.VerseTester.deadline = start_time + time_budget_ms / 1000
+
+		if resplit_option == 'auto':
+			# cheapest first, stop as soon as max score reached
+			# scansion, weights, and pāda results shared across stages
+			V_scanned = V
+			for stage_resplit_option in resplit_cascade:
+				VT.resplit_option = stage_resplit_option
+				V_stage = self.identify_scanned_Verse(copy(V_scanned), stage_resplit_option)
+				if (
+					stage_resplit_option == resplit_cascade[0]
+					or V_stage.identification_score > V.identification_score
+					):
+					V = V_stage # ties go to earlier stage
+				if (
+					V.identification_score == meter_scores["max score"]
+					or V_scanned.text_cleaned == '' # nothing to resplit
+					):
+					break
+
+		else:
+			V = self.identify_scanned_Verse(V, resplit_option)
 
 		if V.meter_label == None: # initial Verse label still not populated
 			V.meter_label = 'na kiṃcid adhyavasitam'  # do not return None
 			V.identification_score = meter_scores["none found"] # did at least try
 
+		V.identification_candidate_count = VT.identification_attempt_count
+		V.identification_partial = VT.budget_exceeded
+
+		if lean: V.make_lean()
+
 		return V
+
+	def identify_meter_many(self, rw_strs, jobs=1, chunksize=16, **kwargs):
+		"""
+		User-facing method.
+
+		Accepts iterable of raw strings (e.g. one verse per line of a whole file)
+		and further arguments as for identify_meter().
+
+		With jobs > 1, shards strings across that many worker processes.
+
+		Lazily yields resulting Verse objects, in input order,
+		as soon as each is available.
+		"""
+
+		if jobs <= 1:
+			for rw_str in rw_strs:
+				yield self.identify_meter(rw_str, **kwargs)
+			return
+
+		with Pool(jobs) as pool:
+			tasks = ( (rw_str, kwargs) for rw_str in rw_strs )
+			for V in pool.imap(identify_meter_in_worker, tasks, chunksize):
+				yield V
+
+
+# one per worker process, so that its identification_memo is reused across tasks
+worker_MeterIdentifier = None
+
+def identify_meter_in_worker(task):
+	"""
+	Internal function, run in worker processes by MeterIdentifier.identify_meter_many().
+
+	Accepts tuple (raw string, keyword arguments for identify_meter()).
+	"""
+	global worker_MeterIdentifier
+	if worker_MeterIdentifier == None:
+		worker_MeterIdentifier = MeterIdentifier()
+	rw_str, kwargs = task
+	return worker_MeterIdentifier.identify_meter(rw_str, **kwargs)
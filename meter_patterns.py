@@ -145,6 +145,19 @@ def choose_heavy_gaRa_pattern(gaRa_pattern):
 	"""
 	return gaRa_pattern[:-5] + gaRa_pattern[-4]
 
+def expand_gaRa_pattern(gaRa_pattern):
+	"""
+		e.g., "...(g|l)" > ["...g", "...l"],
+		e.g., "...(r|B)" > ["...r", "...B"],
+		etc.
+	"""
+	if gaRa_pattern[-1] != ')':
+		return [gaRa_pattern] # no final anceps alternation
+	return [
+		gaRa_pattern[:-5] + gaRa_pattern[-4],
+		gaRa_pattern[:-5] + gaRa_pattern[-2]
+		]
+
 samavfttas_by_family_and_gaRa = {
 
 0: { }, 1: { }, 2: { }, 3: { },
@@ -335,6 +348,38 @@ ardhasamavftta_by_odd_even_regex_tuple = {
 ('ssjg(g|l)', 'sBr(y|j)') : 'aupacchandasika = [11: ssjgg] 1,3 + [12: sBry] 2,4', # aka mālābhāriṇī
 }
 
+"""
+	Exact-match indexes of above gaṇa patterns (final anceps alternations expanded),
+	for dict lookup instead of testing each regex in turn.
+	Where expansions coincide, earlier pattern wins, as with regex order.
+"""
+
+# e.g. samavftta_gaRa_index[11]['ttjgl'] == 'ttjg(g|l)'
+samavftta_gaRa_index = {}
+for family_len, patterns in samavfttas_by_family_and_gaRa.items():
+	samavftta_gaRa_index[family_len] = {}
+	for gaRa_pattern in patterns.keys():
+		for gaRas in expand_gaRa_pattern(gaRa_pattern):
+			samavftta_gaRa_index[family_len].setdefault(gaRas, gaRa_pattern)
+
+# e.g. ardhasamavftta_gaRa_index[('ssjl', 'sBrlg')] == (3, ('ssj(g|l)', 'sBrl(g|l)'))
+# with priority (i.e., position in ardhasamavftta_by_odd_even_regex_tuple) first
+ardhasamavftta_gaRa_index = {}
+for priority, (odd_pattern, even_pattern) in enumerate(
+	ardhasamavftta_by_odd_even_regex_tuple.keys()
+	):
+	for odd_gaRas in expand_gaRa_pattern(odd_pattern):
+		for even_gaRas in expand_gaRa_pattern(even_pattern):
+			ardhasamavftta_gaRa_index.setdefault(
+				(odd_gaRas, even_gaRas), (priority, (odd_pattern, even_pattern))
+				)
+
+# regexes only match beginning of string, so lookups must also try prefixes of these lengths
+ardhasamavftta_gaRa_lens = (
+	sorted(set( len(odd_gaRas) for (odd_gaRas, even_gaRas) in ardhasamavftta_gaRa_index )),
+	sorted(set( len(even_gaRas) for (odd_gaRas, even_gaRas) in ardhasamavftta_gaRa_index ))
+	)
+
 vizamavftta_by_4_tuple = {
 	('sjsl', 'nsjg', 'Bnjlg', 'sjsjg') : 'udgatā = [10: sjsl] + [10: nsjg] + [11: Bnjlg] + [13: sjsjg]',
 	('sjsl', 'nsjg', 'BnBg', 'sjsjg') : 'udgatā 2 = [10: sjsl] + [10: nsjg] + [10: BnBg] + [13: sjsjg]',
@@ -1,4 +1,5 @@
 from skrutable import scheme_maps
+import sys
 
 SLP_short_vowels = ['a','i','u','f','x','ĕ','ŏ'] # latter two exceptions for one-char principle
 SLP_long_vowels = ['A','I','U','F','X','e','E','o','O']
@@ -108,3 +109,51 @@ to_add = [' ', '\t', '\n']
 for k in character_set.keys():
 	for c in to_add:
 		character_set[k].append(c)
+
+# code-point-indexed character class table, for membership tests in hot loops
+# use like e.g. char_classes[ord(c)] & flag_vowel (nonzero if c is SLP vowel)
+# or e.g. char_classes[ord(c)] & (flag_long_vowel | flag_anusvAra_visarga)
+
+flag_vowel = 1 # SLP
+flag_long_vowel = 2 # SLP
+flag_unvoiced_consonant = 4 # SLP
+flag_voiced_consonant = 8 # SLP
+flag_indic_consonant = 16
+flag_anusvAra_visarga = 32 # SLP
+flag_mAtrA = 64
+flag_virAma = 128
+
+flag_consonant = flag_unvoiced_consonant | flag_voiced_consonant # i.e., SLP_consonants
+
+char_class_members = {
+flag_vowel: SLP_vowels,
+flag_long_vowel: SLP_long_vowels,
+flag_unvoiced_consonant: SLP_unvoiced_consonants,
+flag_voiced_consonant: SLP_voiced_consonants,
+flag_indic_consonant: DEV_consonants + BENGALI_consonants + GUJARATI_consonants,
+flag_anusvAra_visarga: ['M', 'H'],
+flag_mAtrA: DEV_vowel_mAtrAs + BENGALI_vowel_mAtrAs + GUJARATI_vowel_mAtrAs,
+flag_virAma: list(virAmas.values()),
+}
+
+def build_char_classes(members_by_flag):
+	"""
+	Returns immutable table (bytes) indexed by code point (any),
+	with each entry combining flags of all classes containing that character.
+	"""
+	table = bytearray(sys.maxunicode + 1)
+	for flag, members in members_by_flag.items():
+		for c in members:
+			table[ord(c)] |= flag
+	return bytes(table)
+
+char_classes = build_char_classes(char_class_members)
+
+def chars_with_flag(flags):
+	"""
+	Returns string of characters having any of given flags, in order of char_class_members.
+	"""
+	return ''.join( dict.fromkeys(
+		c	for flag, members in char_class_members.items() if flag & flags
+			for c in members
+		) )
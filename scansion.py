@@ -6,12 +6,83 @@ from skrutable.config import load_config_dict_from_json_file
 import os.path
 import json
 import re
+import numpy as np
 
 # load config variables
 config = load_config_dict_from_json_file()
 scansion_syllable_separator = config["scansion_syllable_separator"] # e.g. " "
 additional_pAda_separators = config["additional_pAda_separators"]  # e.g. ["\t", ";"]
 
+weights_to_bits = str.maketrans('lg', '01') # for Scanner.pack_syllable_weights()
+
+# for Scanner.scan_SLP_corpus(), use like e.g. char_class_array[code_points]
+char_class_array = np.frombuffer(phonemes.char_classes, dtype=np.uint8)
+
+# for Scanner.syllabify_line(): any non-vowels, then vowel (or M or H), then any M or H
+syllable_regex = re.compile(
+	'[^{0}]*[{0}][{1}]*'.format(
+		re.escape( phonemes.chars_with_flag(phonemes.flag_vowel | phonemes.flag_anusvAra_visarga) ),
+		re.escape( phonemes.chars_with_flag(phonemes.flag_anusvAra_visarga) ),
+		)
+	)
+
+def separate_syllables(syllables):
+	"""Returns syllables joined, each followed by scansion_syllable_separator."""
+	if syllables == []:
+		return ''
+	return scansion_syllable_separator.join(syllables) + scansion_syllable_separator
+
+class DeletionTable(dict):
+	"""
+	Internal translation table for str.translate(),
+	keeping only allowed characters and deleting all others.
+
+	Each other character is looked up only once, then remembered for deletion.
+	"""
+
+	def __init__(self, allowed_chars):
+		super().__init__( (ord(c), ord(c)) for c in allowed_chars )
+
+	def __missing__(self, code_point):
+		self[code_point] = None
+		return None
+
+# for Scanner.clean_input(), use like e.g. deletion_tables['IAST']
+deletion_tables = {
+	scheme : DeletionTable(chars) for scheme, chars in phonemes.character_set.items()
+	}
+
+def compile_cleaning_regex(pAda_separators):
+	"""
+	Internal function.
+
+	Returns regex for Scanner.clean_input(), finding in single pass
+	runs of newlines and pāda separators (incl. carriage returns).
+
+	Buffer-initial and -final whitespace is left to str.strip(),
+	since matching it here (overlapping with newlines) can backtrack exponentially.
+	"""
+	line_break = '|'.join( [re.escape(sep) for sep in pAda_separators] + ['\n'] )
+	return re.compile( r'(?:(?:%s)\r?)+' % line_break )
+
+cleaning_regex = compile_cleaning_regex(additional_pAda_separators)
+
+def gaRa_abbreviation(syl_wts):
+	"""
+	Internal function, see Scanner.gaRa_abbreviate().
+	Also used for deriving Verse.gaRas_by_pAda.
+	"""
+
+	if syl_wts.count('l') + syl_wts.count('g') != len(syl_wts):
+		return None
+
+	full_gaRas_len = len(syl_wts) - len(syl_wts) % 3
+
+	return ''.join(
+		meter_patterns.gaRas_by_weights[ syl_wts[i:i+3] ]
+		for i in range(0, full_gaRas_len, 3)
+		) + syl_wts[full_gaRas_len:] # leftover lights and heavies (l/g)
+
 class Verse(object):
 	"""
 	User-facing patient-style object, basically a bundle of attributes.
@@ -23,19 +94,104 @@ class Verse(object):
 
 	Single method summarize() formats key attributes for display
 	whether via command line or graphical user interface.
+
+	Compact: uses __slots__ and stores weights once as per-pāda (i.e., per-line) tuple.
+	Multi-line syllable_weights and gaRa_abbreviations strings are derived on access,
+	morae and gaṇas are derived from weights only when first needed,
+	and summarize() output is kept until relevant attributes change.
 	"""
 
+	__slots__ = [
+		'text_raw', 'original_scheme', 'text_cleaned', 'text_SLP', 'text_syllabified',
+		'pAda_weights', 'pAda_morae', 'pAda_gaRas',
+		'meter_label', 'identification_score',
+		'identification_candidate_count', 'identification_partial',
+		'summaries',
+		]
+
 	def __init__(self):
 		self.text_raw = None			# string, may contain newlines
 		self.original_scheme = None		# string
 		self.text_cleaned = None		# string, may contain newlines
 		self.text_SLP = None			# string, may contain newlines
 		self.text_syllabified = None	# string, may contain newlines
-		self.syllable_weights = None	# string, may contain newlines
-		self.morae_per_line = None 		# list of integers
-		self.gaRa_abbreviations = None	# string, may contain newlines
+		self.pAda_weights = None		# tuple of strings, see weights_by_pAda
+		self.pAda_morae = None			# list of integers, None until derived
+		self.pAda_gaRas = None			# tuple of strings, None until derived
 		self.meter_label = None			# string
 		self.identification_score = 0 	# int
+		self.identification_candidate_count = 0	# int, e.g. number of resplits tested
+		self.identification_partial = False	# bool, True if search stopped early by budget
+		self.summaries = None			# dict, summarize() output by display options
+
+	@property
+	def weights_by_pAda(self):
+		"""Tuple of light/heavy (l/g) strings, one per line."""
+		return self.pAda_weights
+
+	@weights_by_pAda.setter
+	def weights_by_pAda(self, value):
+		self.pAda_weights = None if value == None else tuple(value)
+		self.pAda_morae = self.pAda_gaRas = None # derive again when needed
+		self.summaries = None
+
+	@property
+	def syllable_weights(self):
+		"""String, may contain newlines."""
+		if self.pAda_weights == None:
+			return None
+		return '\n'.join(self.pAda_weights)
+
+	@syllable_weights.setter
+	def syllable_weights(self, value):
+		self.weights_by_pAda = None if value == None else value.split('\n')
+
+	@property
+	def morae_per_line(self):
+		"""List of integers."""
+		if self.pAda_morae == None and self.pAda_weights != None:
+			self.pAda_morae = [
+				w.count('l') * 1 + w.count('g') * 2 for w in self.pAda_weights
+				]
+		return self.pAda_morae
+
+	@morae_per_line.setter
+	def morae_per_line(self, value):
+		self.pAda_morae = value
+		self.summaries = None
+
+	@property
+	def gaRas_by_pAda(self):
+		"""Tuple of gaṇa abbreviation strings, one per line."""
+		if self.pAda_gaRas == None and self.pAda_weights != None:
+			self.pAda_gaRas = tuple(
+				gaRa_abbreviation(w) for w in self.pAda_weights
+				)
+		return self.pAda_gaRas
+
+	@gaRas_by_pAda.setter
+	def gaRas_by_pAda(self, value):
+		self.pAda_gaRas = None if value == None else tuple(value)
+		self.summaries = None
+
+	@property
+	def gaRa_abbreviations(self):
+		"""String, may contain newlines."""
+		if self.gaRas_by_pAda == None:
+			return None
+		return '\n'.join(self.gaRas_by_pAda)
+
+	@gaRa_abbreviations.setter
+	def gaRa_abbreviations(self, value):
+		self.gaRas_by_pAda = None if value == None else value.split('\n')
+
+	def make_lean(self):
+		"""
+		Drops intermediate text (cleaned, SLP, and syllabified) to save memory,
+		e.g. for bulk runs. Afterward, summarize() cannot show alignment.
+		"""
+		self.text_cleaned = self.text_SLP = self.text_syllabified = None
+		self.summaries = None
 
 	def summarize(self,
 		show_weights=True, show_morae=True, show_gaRas=True, # part_A
@@ -53,17 +209,53 @@ class Verse(object):
 			right-justified alignment of vowel-final syllables and their weights
 			meter label (if available)
 		"""
-		part_A = part_B = part_C = ''
+		if self.summaries == None:
+			self.summaries = {}
+		# text_syllabified included since not watched like weights, morae, and gaṇas
+		summary_key = (
+			show_weights, show_morae, show_gaRas, show_alignment, self.text_syllabified
+			)
+		if summary_key not in self.summaries:
+			self.summaries[summary_key] = self.summarize_scansion(*summary_key[:4])
+		part_A_and_B = self.summaries[summary_key]
+
+		part_C = ''
+
+		# part_C
+
+		if show_label:
+
+			if self.meter_label == None:
+				part_C += '(vṛttaṃ gaṇyatām...)'
+			else:
+				part_C += self.meter_label
+
+			if self.identification_partial:
+				part_C += ' (? %d vikalpāḥ eva parīkṣitāḥ)' % self.identification_candidate_count
+
+			if part_C != '': part_C += '\n'
+
+		cumulative_output = ''.join([part_A_and_B, part_C])
+		return cumulative_output
+
+	def summarize_scansion(self,
+		show_weights, show_morae, show_gaRas, # part_A
+		show_alignment # part_B
+		):
+		"""
+		Returns scansion part (i.e., without meter label) of summarize() output.
+		"""
+		part_A = part_B = ''
 
 		# part_A
 
 		if show_weights or show_morae or show_gaRas:
 
 			max_weights_len = max(
-				[ len(line) for line in self.syllable_weights.split('\n') ]
+				[ len(line) for line in self.weights_by_pAda ]
 				)
 
-			for i, weights in enumerate(self.syllable_weights.split('\n')):
+			for i, weights in enumerate(self.weights_by_pAda):
 
 				line = ''
 				if show_weights:
@@ -71,7 +263,7 @@ class Verse(object):
 				if show_morae:
 					line += ' %10s' % '{m: %s}' % str(self.morae_per_line[i])
 				if show_gaRas:
-					line += ' %11s' % '[%d: %s]' % (len(weights), self.gaRa_abbreviations.split('\n')[i])
+					line += ' %11s' % '[%d: %s]' % (len(weights), self.gaRas_by_pAda[i])
 				if show_weights or show_morae or show_gaRas:
 					line += '\n'
 				part_A += line
@@ -80,7 +272,7 @@ class Verse(object):
 
 		# part_B
 
-		if show_alignment:
+		if show_alignment and self.text_syllabified != None: # not if dropped for lean Verse
 
 			# IAST is standard output for alignment (as well as meter label)
 			T = Transliterator(from_scheme='SLP', to_scheme='IAST')
@@ -104,25 +296,13 @@ class Verse(object):
 				part_B += '\n'
 
 				# display corresponding weights aligned underneath each syllable
-				for s_w in self.syllable_weights.split('\n')[i]:
+				for s_w in self.weights_by_pAda[i]:
 					part_B += part_B_cell % s_w
 				part_B += '\n'
 
 			if part_B != '': part_B += '\n'
 
-		# part_C
-
-		if show_label:
-
-			if self.meter_label == None:
-				part_C += '(vṛttaṃ gaṇyatām...)'
-			else:
-				part_C += self.meter_label
-
-			if part_C != '': part_C += '\n'
-
-		cumulative_output = ''.join([part_A, part_B, part_C])
-		return cumulative_output
+		return part_A + part_B
 
 
 class Scanner(object):
@@ -154,22 +334,14 @@ class Scanner(object):
 
 		# manage additional newlines
 
-		for chr in additional_pAda_separators:
-			cntnts = cntnts.replace(chr, '\n')
+		# replace additional pāda separators with newlines
 		# also dedupe, also allowing for carriage returns introduced in HTML form input
-		regex = re.compile(r"(\n\r?){2,}")
-		cntnts = re.sub(regex, '\n', cntnts)
-		# also remove buffer-initial and -final newlines
-		regex = re.compile(r"(\A\s*)|(\s*\Z)")
-		cntnts = re.sub(regex, '', cntnts)
+		# then remove buffer-initial and -final whitespace
+		cntnts = cleaning_regex.sub('\n', cntnts).strip()
 
 		# filter out disallowed characters
 
-		for c in list(set(cntnts)):
-			if c not in phonemes.character_set[scheme_in]:
-				cntnts = cntnts.replace(c,'')
-
-		return cntnts
+		return cntnts.translate(deletion_tables[scheme_in])
 
 	def syllabify_text(self, txt_SLP):
 		"""
@@ -183,56 +355,49 @@ class Scanner(object):
 
 		# e.g. text == 'yadA yadA hi Darmasya glAnir Bavati BArata /\naByutTAnam aDarmasya...'
 
-		# final cleaning for scansion: irrelevant horizontal white space
-		horizontal_white_space = [' ', '\t']
-		for c in horizontal_white_space:
-			txt_SLP = txt_SLP.replace(c,'')
-		# e.g. 'yadAyadAhiDarmasyaglAnirBavatiBArata\naByutTAnamaDarmasya...'
-
 		# treat lines individually (newlines to be restored upon return)
-		text_lines = txt_SLP.split('\n')
-		syllables_by_line = []
-
-		for line in text_lines:
-
-			# line == e.g. 'yadAyadAhiDarmasyaglAnirBavatiBArata'
-
-			line_syllables = ''
-
-			# place scansion_syllable_separator after vowels
-			for letter in line:
+		return '\n'.join(
+			self.syllabify_line(line)[0] for line in txt_SLP.split('\n')
+			)
 
-				# exception: do treat M and H as explicit syllable coda
-				if letter in ['M', 'H']:
-					if line_syllables[-1] == scansion_syllable_separator:
-						line_syllables = line_syllables[:-1]
+	def syllabify_line(self, line):
+		"""
+		Accepts single line of SLP text (no newlines).
 
-				line_syllables += letter
+		Syllabifies in single left-to-right pass (see syllabify_text()).
 
-				if letter in phonemes.SLP_vowels + ['M', 'H']:
-					line_syllables += scansion_syllable_separator
+		Returns tuple of syllabified line (string) and list of its syllables.
+		"""
 
-			# e.g. 'ya.dA.ya.dA.hi.Da.rma.sya.glA.ni.rBa.va.ti.BA.ra.ta.'
-			# BUT e.g. 'a.Byu.tTA.na.ma.Da.rma.sya.ta.dA.tmA.na.Msf.jA.mya.ha.m'
+		# final cleaning for scansion: irrelevant horizontal white space
+		line = line.replace(' ', '').replace('\t', '')
+		# e.g. 'yadAyadAhiDarmasyaglAnirBavatiBArata'
 
-			try:
-				# remove final scansion_syllable_separator before final consonant(s)
-				if line_syllables[-1] in phonemes.SLP_consonants_for_scansion:
+		# close syllable after each vowel, with any following M and H as explicit coda
+		syllables = syllable_regex.findall(line)
+		curr_syllable = line[ sum(map(len, syllables)): ] # left over
 
-					# final separator is incorrect, remove
-					final_separator = line_syllables.rfind(scansion_syllable_separator)
-					line_syllables = ( line_syllables[:final_separator]
-										+ line_syllables[final_separator+1:] )
+		# e.g. ['ya','dA','ya','dA','hi','Da','rma','sya','glA','ni','rBa','va','ti','BA','ra','ta']
+		# BUT e.g. [..., 'tmA', 'naM', 'sf', 'jA', 'mya', 'ha'] with 'm' left over
 
-					line_syllables += scansion_syllable_separator
+		if curr_syllable == '':
+			syllabified_line = separate_syllables(syllables)
 
-				# e.g. 'a.Byu.tTA.na.ma.Da.rma.sya.ta.dA.tmA.na.Msf.jA.mya.ham.'
-			except IndexError: pass
+		elif phonemes.char_classes[ord(curr_syllable[-1])] & phonemes.flag_consonant:
+			# final consonant(s) belong to last syllable, if any
+			if syllables:
+				syllables[-1] += curr_syllable
+			else:
+				syllables.append(curr_syllable)
+			syllabified_line = separate_syllables(syllables)
+			# e.g. [..., 'tmA', 'naM', 'sf', 'jA', 'mya', 'ham']
 
-			syllables_by_line.append(line_syllables)
+		else:
+			# anything else left over: own syllable, without final separator
+			syllables.append(curr_syllable)
+			syllabified_line = scansion_syllable_separator.join(syllables)
 
-		text_syllabified = '\n'.join(syllables_by_line) # restore newlines
-		return text_syllabified
+		return syllabified_line, syllables
 
 
 	def scan_syllable_weights(self, txt_syl):
@@ -250,8 +415,6 @@ class Scanner(object):
 
 		for line in text_lines:
 
-			line_weights = ''
-
 			syllables = line.split(scansion_syllable_separator)
 
 			try:
@@ -259,36 +422,69 @@ class Scanner(object):
 					syllables.pop(-1) # in case of final separator(s)
 			except IndexError: pass
 
-			for n, syllable in enumerate(syllables):
+			# only last syllable of line lacks following syllable
+			weights_within_line, weights_line_final = (
+				self.scan_syllable_weight_variants(syllables)
+				)
+			line_weights = weights_within_line[:-1] + weights_line_final[-1:]
+			# line_weights could use 'g_' instead of 'g'
+			# insofar as two 'l's can equal one 'g', for better visual alignment
 
-				if (
-					# heavy by nature
-					syllable[-1] in phonemes.SLP_long_vowels + ['M', 'H']
+			weights_by_line.append(line_weights)
 
-					or
+		syllable_weights = '\n'.join(weights_by_line) # restore newlines
+		return syllable_weights
 
-					# heavy by position:
-					# consonant closes syllable or is second letter of next syllable
-					syllable[-1] in (phonemes.SLP_consonants_for_scansion)
-					or
-					n <= (len(syllables)-2)
-					and len(syllables[n+1]) > 1
-					and syllables[n+1][1] in (phonemes.SLP_consonants_for_scansion)
 
-					):
+	def scan_syllable_weight_variants(self, syllables):
+		"""
+		Accepts list of syllables (without scansion_syllable_separator),
+		each assumed to be followed by the next one within the same line.
 
-					line_weights += 'g'
-					# line_weights += 'g_'
-					# insofar as two 'l's can equal one 'g', could use this alternative for better visual alignment
+		Since a syllable's weight can only change by its becoming line-final,
+		returns tuple of two light/heavy (l/g) strings of same length as list:
+			weights of each syllable within line (i.e., followed by next)
+			weights of each syllable if line-final (i.e., followed by nothing)
+		"""
 
-				else:
+		char_classes = phonemes.char_classes
+		heavy_finals = phonemes.flag_long_vowel | phonemes.flag_anusvAra_visarga
+		consonants = phonemes.flag_consonant # i.e., SLP_consonants_for_scansion
 
-					line_weights += 'l'
+		weights_within_line = []
+		weights_line_final = []
 
-			weights_by_line.append(line_weights)
+		for n, syllable in enumerate(syllables):
 
-		syllable_weights = '\n'.join(weights_by_line) # restore newlines
-		return syllable_weights
+			if (
+				# heavy by nature
+				char_classes[ord(syllable[-1])] & heavy_finals
+
+				or
+
+				# heavy by position: consonant closes syllable
+				char_classes[ord(syllable[-1])] & consonants
+
+				):
+
+				weights_within_line.append('g')
+				weights_line_final.append('g')
+
+			else:
+
+				weights_line_final.append('l')
+
+				# heavy by position: consonant is second letter of next syllable
+				if (
+					n <= (len(syllables)-2)
+					and len(syllables[n+1]) > 1
+					and char_classes[ord(syllables[n+1][1])] & consonants
+					):
+					weights_within_line.append('g')
+				else:
+					weights_within_line.append('l')
+
+		return ''.join(weights_within_line), ''.join(weights_line_final)
 
 
 	def count_morae(self, syl_wts):
@@ -310,33 +506,186 @@ class Scanner(object):
 		return morae_per_line
 
 
+	def pack_syllable_weights(self, syl_wts):
+		"""
+		Accepts one-line string of light/heavy (l/g) pattern, e.g., 'lglgllgl'.
+
+		Returns integer with one bit per syllable (heavy as 1, first syllable highest),
+		e.g. 0b01010010 (i.e., 82); length must be tracked separately.
+
+		Returns None if anything other than l/g is found.
+		"""
+
+		if syl_wts == '' or syl_wts.count('l') + syl_wts.count('g') != len(syl_wts):
+			return None
+
+		return int(syl_wts.translate(weights_to_bits), 2)
+
+
 	def gaRa_abbreviate(self, syl_wts):
 		"""
 		Accepts one-line string of light/heavy (l/g) pattern, e.g., 'lllgggl'.
 
 		Returns string of 'gaRa'-trisyllable abbreviation, e.g. 'nml'.
 		"""
+		return gaRa_abbreviation(syl_wts)
+
+	def weigh_syllables(self, syllables):
+		"""
+		Accepts list of syllables of single line (e.g. from syllabify_line()).
+
+		Returns light/heavy (l/g) pattern as string, last syllable as line-final.
+		"""
+
+		char_classes = phonemes.char_classes
+		heavy_finals = (
+			phonemes.flag_long_vowel | phonemes.flag_anusvAra_visarga | phonemes.flag_consonant
+			)
+		consonants = phonemes.flag_consonant
+		last = len(syllables) - 1
+
+		return ''.join(
+			'g' if (
+				# heavy by nature, or by position: consonant closes syllable
+				char_classes[ord(syllable[-1])] & heavy_finals
+
+				or
+
+				# heavy by position: consonant is second letter of next syllable
+				n < last
+				and len(syllables[n+1]) > 1
+				and char_classes[ord(syllables[n+1][1])] & consonants
+				)
+			else 'l'
+			for n, syllable in enumerate(syllables)
+			)
+
+	def scan_weights(self, cntnts, from_scheme=None):
+		"""
+		Lighter alternative to scan() for when only syllable weights are needed.
+
+		Accepts raw text, as for scan().
+
+		Returns only (newline-separated) multi-line string of light/heavy (l/g) pattern,
+		same as scan().syllable_weights, without making Verse object or other strings.
+		"""
+
+		T = self.set_up_Transliterator(from_scheme)
+		txt_SLP = T.transliterate( self.clean_input(cntnts, T.scheme_in) )
+
+		return '\n'.join(
+			self.weigh_syllables( self.syllabify_line(line)[1] )
+			for line in txt_SLP.split('\n')
+			)
+
+	def scan_corpus(self, cntnts, from_scheme=None):
+		"""
+		Bulk alternative to scan() for corpus-scale analysis.
+
+		Accepts raw text, as for scan(), but of any length (e.g. whole work).
+
+		Returns same as scan_SLP_corpus(), for lines as after cleaning (see clean_input()).
+		"""
+
+		T = self.set_up_Transliterator(from_scheme)
+		txt_SLP = T.transliterate( self.clean_input(cntnts, T.scheme_in) )
 
-		for c in list(set(syl_wts)):
-			if c not in ['l','g']:
-				return None
+		return self.scan_SLP_corpus(txt_SLP)
 
-		weights_of_curr_gaRa = ''
-		overall_abbreviation = ''
+	def scan_SLP_corpus(self, txt_SLP):
+		"""
+		Accepts (newline-separated) multi-line string of SLP text.
 
-		for single_weight in syl_wts:
-			weights_of_curr_gaRa += single_weight
-			if len(weights_of_curr_gaRa) == 3:
-				overall_abbreviation += meter_patterns.gaRas_by_weights[weights_of_curr_gaRa]
-				weights_of_curr_gaRa = ''
+		Scans all lines at once with array operations on character classes
+		(see phonemes.char_classes), with same results as
+		syllabify_text() followed by scan_syllable_weights() and count_morae().
 
-		# leftover lights and heavies (l/g)
-		overall_abbreviation += weights_of_curr_gaRa
+		Returns tuple of three integer arrays (CSR-style):
+			syllable offsets by line (length: number of lines + 1),
+				i.e., weights of line i are weights[offsets[i]:offsets[i+1]]
+			weights of all syllables (heavy as 1, light as 0)
+			morae by line
+		"""
+
+		txt_SLP = txt_SLP.replace(' ', '').replace('\t', '')
+		code_points = np.frombuffer(txt_SLP.encode('utf-32-le'), dtype=np.uint32)
+		char_class = char_class_array[code_points]
+		char_count = len(code_points)
+
+		is_newline = code_points == ord('\n')
+		line_count = int(is_newline.sum()) + 1
+		positions = np.arange(char_count)
+
+		# syllable ends after each vowel (or M or H), with any following M and H as coda
+		is_syllable_final = ( char_class
+			& (phonemes.flag_vowel | phonemes.flag_anusvAra_visarga) ) != 0
+		is_coda = ( char_class & phonemes.flag_anusvAra_visarga ) != 0
+		is_end = is_syllable_final.copy()
+		is_end[:-1] &= ~is_coda[1:]
+
+		# anything left over at line end: syllable ends there instead...
+		is_line_final = np.zeros(char_count, dtype=bool)
+		is_line_final[:-1] = is_newline[1:]
+		if char_count: is_line_final[-1] = True
+		is_line_final &= ~is_newline # i.e., nonempty lines only
+		line_final_positions = positions[is_line_final]
+		line_final_is_consonant = (
+			char_class[line_final_positions] & phonemes.flag_consonant ) != 0
+
+		# ... but final consonant(s) belong to last syllable, if any
+		last_boundary = np.maximum.accumulate( np.where(is_end | is_newline, positions, -1) )
+		previous_boundaries = np.where(
+			line_final_positions > 0, last_boundary[line_final_positions - 1], -1 )
+		merge_into = previous_boundaries[ line_final_is_consonant
+			& (previous_boundaries >= 0) ]
+		merge_into = merge_into[ ~is_newline[merge_into] ]
+		is_end[merge_into] = False
+		is_end[line_final_positions] = True
+
+		# weights: heavy by nature, or by position (consonant closes syllable)
+		ends = positions[is_end]
+		heavy = ( char_class[ends] & (
+			phonemes.flag_long_vowel | phonemes.flag_anusvAra_visarga | phonemes.flag_consonant
+			) ) != 0
+
+		# or by position: consonant is second letter of next syllable (within line)
+		line_of_syllable = np.cumsum(is_newline)[ends]
+		has_next = np.zeros(len(ends), dtype=bool)
+		has_next[:-1] = line_of_syllable[1:] == line_of_syllable[:-1]
+		next_second = ends + 2
+		next_is_long = np.zeros(len(ends), dtype=bool)
+		next_is_long[:-1] = ends[1:] >= next_second[:-1]
+		next_second_is_consonant = np.zeros(len(ends), dtype=bool)
+		next_second_is_consonant[has_next & next_is_long] = (
+			char_class[ next_second[has_next & next_is_long] ] & phonemes.flag_consonant ) != 0
+		heavy |= next_second_is_consonant
+
+		weights = heavy.astype(np.uint8)
+		syllables_by_line = np.bincount(line_of_syllable, minlength=line_count)
+		offsets = np.zeros(line_count + 1, dtype=np.int64)
+		np.cumsum(syllables_by_line, out=offsets[1:])
+		morae_by_line = np.bincount(
+			line_of_syllable, weights=weights + 1, minlength=line_count ).astype(np.int64)
+
+		return offsets, weights, morae_by_line
+
+	def set_up_Transliterator(self, from_scheme=None):
+		"""
+		Returns Transliterator object set to transliterate to SLP,
+		from given scheme or else from default or detected one.
+		"""
 
-		return overall_abbreviation
+		T = Transliterator() # default settings
+		if from_scheme != None:
+			from_scheme = from_scheme.upper()
+			T.scheme_in = from_scheme
+		elif T.scheme_in.upper() in scheme_detection.auto_detect_synonyms:
+			T.set_detected_scheme()
+		T.scheme_out = 'SLP'
+		return T
 
 
-	def scan(self, cntnts, from_scheme=None):
+	def scan(self, cntnts, from_scheme=None, lean=False):
 		"""
 		Manages overall scansion procedure:
 			accept raw text
@@ -348,30 +697,31 @@ class Scanner(object):
 			count morae per line
 
 		Returns results of each of these steps as attributes of single Verse object.
+
+		If lean, intermediate text is dropped (see Verse.make_lean()).
 		"""
 
 		V = Verse()
 		V.text_raw = cntnts
 
 		# set up Transliterator and schemes
-		T = Transliterator() # default settings
-		if from_scheme != None:
-			from_scheme = from_scheme.upper()
-			T.scheme_in = from_scheme
-		elif T.scheme_in.upper() in scheme_detection.auto_detect_synonyms:
-			T.set_detected_scheme()
-
+		T = self.set_up_Transliterator(from_scheme)
 		V.original_scheme = T.scheme_in
-		T.scheme_out = 'SLP'
 
 		V.text_cleaned = self.clean_input(V.text_raw, V.original_scheme)
 		V.text_SLP = T.transliterate(V.text_cleaned)
-		V.text_syllabified = self.syllabify_text(V.text_SLP)
-		V.syllable_weights = self.scan_syllable_weights(V.text_syllabified)
-		V.morae_per_line = self.count_morae(V.syllable_weights)
-		V.gaRa_abbreviations = '\n'.join(
-		[ self.gaRa_abbreviate(line) for line in V.syllable_weights.split('\n') ]
-		)
+
+		# syllabification and weights together, line by line
+		# (morae and gaṇas derived from weights when needed, see Verse)
+		syllabified_lines = []
+		weights_by_line = []
+		for line in V.text_SLP.split('\n'):
+			syllabified_line, syllables = self.syllabify_line(line)
+			syllabified_lines.append(syllabified_line)
+			weights_by_line.append( self.weigh_syllables(syllables) )
+		V.text_syllabified = '\n'.join(syllabified_lines)
+		V.weights_by_pAda = weights_by_line
+		if lean: V.make_lean()
 
 		self.Verse = V
 		self.Transliterator = T
@@ -1,11 +1,26 @@
 from skrutable import scheme_vectors_mbh
-from numpy import dot
-from numpy.linalg import norm
-import operator
+from skrutable.config import load_config_dict_from_json_file
+import numpy as np
+
+# load config variables
+config = load_config_dict_from_json_file()
+initial_sample_size = config["scheme_detection_initial_sample_size"] # e.g. 1000
+max_sample_size = config["scheme_detection_max_sample_size"] # e.g. 1000000
+confidence_margin = config["scheme_detection_confidence_margin"] # e.g. 0.05
 
 auto_detect_synonyms = ( ['AUTO', 'DETECT', 'AUTO DETECT',
 						'AUTO-DETECT', 'AUTO_DETECT', 'AUTODETECT'] )
 
+# reference vectors loaded once as (n_schemes x 10000) matrix,
+# each row pre-normalized to unit length, so that one matrix-vector product
+# gives (scaled) cosine similarity with every scheme at once
+scheme_names = list(scheme_vectors_mbh.all.keys())
+reference_matrix = np.array(
+	list(scheme_vectors_mbh.all.values()), dtype=np.float32
+	)
+reference_matrix /= np.linalg.norm(reference_matrix, axis=1, keepdims=True)
+fingerprint_len = reference_matrix.shape[1] # 10,000 code points
+
 class SchemeDetector(object):
 
 	def __init__(self): pass
@@ -14,15 +29,28 @@ class SchemeDetector(object):
 		"""
 		Internal method.
 
-		Returns a 10,000-dimensional vector (list) with Unicode frequency counts.
+		Returns a 10,000-dimensional vector (NumPy array) with Unicode frequency counts.
+		Code points beyond that range are ignored.
 		"""
-		code_point_frequency_vector = [0] * 10000
-		for char in file_data:
-			code_point_frequency_vector[ord(char)] += 1
+		code_points = np.frombuffer(file_data.encode('utf-32-le'), dtype=np.uint32)
+		code_points = code_points[code_points < fingerprint_len]
+		code_point_frequency_vector = np.bincount(code_points, minlength=fingerprint_len)
 		return code_point_frequency_vector # Unicode code-point "fingerprint"
 
 	def cosine_similarity(self, a, b):
-		return dot(a, b) / (norm(a) * norm(b))
+		return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+	def score_schemes(self, file_vector):
+		"""
+		Internal method.
+
+		Returns array of cosine similarities of fingerprint with each of scheme_names.
+		"""
+		file_vector = file_vector.astype(np.float32)
+		file_norm = np.linalg.norm(file_vector)
+		if file_norm == 0:
+			return np.zeros(len(scheme_names), dtype=np.float32)
+		return reference_matrix.dot(file_vector) / file_norm
 
 	def detect_scheme(self, file_data=""):
 		"""
@@ -36,11 +64,96 @@ class SchemeDetector(object):
 		#	 print("input might be too short to accurately detect scheme...")
 
 		file_vector = self.fingerprint(file_data)
+		scheme_scores = self.score_schemes(file_vector)
 
-		scheme_scores = {}
-		for scheme, mbh_vector in scheme_vectors_mbh.all.items():
-			scheme_scores[scheme] = self.cosine_similarity(file_vector, mbh_vector)
-			# print("similarity with mbh %s: %1.3f" % (scheme, cosine_similarity(file_vector, mbh_vector) ) )
-
-		scheme_with_max_score = max(scheme_scores.items(), key=operator.itemgetter(1))[0]
+		scheme_with_max_score = scheme_names[int(np.argmax(scheme_scores))]
 		return scheme_with_max_score
+
+	def detect_scheme_early_exit(self, file_data="",
+		initial_sample_size=initial_sample_size,
+		max_sample_size=max_sample_size,
+		confidence_margin=confidence_margin):
+		"""
+		User-facing method.
+
+		Like detect_scheme(), but fingerprints growing prefixes of input
+		(initial_sample_size, then doubling each time, up to max_sample_size),
+		stopping as soon as margin between top two cosine scores
+		reaches confidence_margin (see config.json).
+		Only new part of each prefix is counted, so total work is bounded by max_sample_size.
+
+		Returns tuple (scheme, confidence), where confidence is final margin.
+		"""
+
+		if file_data == "": return (None, 0.0)
+
+		file_vector = np.zeros(fingerprint_len, dtype=np.int64)
+		counted_len = 0
+		sample_size = initial_sample_size
+
+		while True:
+
+			sample_size = min(sample_size, max_sample_size, len(file_data))
+			file_vector += self.fingerprint(file_data[counted_len:sample_size])
+			counted_len = sample_size
+
+			scheme_scores = self.score_schemes(file_vector)
+			runner_up, winner = np.argsort(scheme_scores)[-2:]
+			confidence = float(scheme_scores[winner] - scheme_scores[runner_up])
+
+			if (confidence >= confidence_margin
+				or counted_len == len(file_data)
+				or counted_len == max_sample_size):
+				return (scheme_names[int(winner)], confidence)
+
+			sample_size *= 2
+
+	def detect_many(self, texts):
+		"""
+		User-facing method.
+
+		Accepts list of strings, e.g. many small documents.
+
+		Fingerprints whole batch at once as sparse (document, code point) counts
+		and scores these against all reference vectors in one sparse product,
+		with no Python loop over documents or characters.
+
+		Returns tuple (labels, scores):
+		list of detected scheme per document (None if empty, as in detect_scheme()),
+		and (n_documents x n_schemes) array of cosine similarities,
+		with columns in order of scheme_names.
+		"""
+
+		n_docs = len(texts)
+		doc_lens = np.fromiter((len(text) for text in texts), dtype=np.int64, count=n_docs)
+
+		code_points = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+		doc_ids = np.repeat(np.arange(n_docs), doc_lens)
+		in_range = code_points < fingerprint_len
+		code_points, doc_ids = code_points[in_range], doc_ids[in_range]
+
+		# sparse fingerprint matrix in coordinate form: (doc, code point) -> count
+		keys, counts = np.unique(
+			doc_ids * fingerprint_len + code_points, return_counts=True
+			)
+		nz_docs, nz_code_points = np.divmod(keys, fingerprint_len)
+		counts = counts.astype(np.float32)
+
+		# sparse product with (pre-normalized) reference matrix, scheme by scheme
+		scores = np.zeros((n_docs, len(scheme_names)), dtype=np.float32)
+		for i in range(len(scheme_names)):
+			scores[:, i] = np.bincount(
+				nz_docs,
+				weights=counts * reference_matrix[i, nz_code_points],
+				minlength=n_docs
+				)
+
+		doc_norms = np.sqrt(np.bincount(nz_docs, weights=counts ** 2, minlength=n_docs))
+		nonzero = doc_norms > 0
+		scores[nonzero] /= doc_norms[nonzero, None]
+
+		labels = [ scheme_names[i] for i in np.argmax(scores, axis=1) ]
+		for i in np.flatnonzero(doc_lens == 0):
+			labels[i] = None
+
+		return (labels, scores)
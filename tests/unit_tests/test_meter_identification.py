@@ -3,6 +3,10 @@ import inspect
 from skrutable.scansion import Scanner
 from skrutable.meter_identification import MeterIdentifier
 from skrutable.meter_identification import VerseTester
+from skrutable.meter_identification import ResplitCandidate, resplit_candidates_kept
+from skrutable.meter_identification import IdentificationMemo
+from skrutable.meter_identification import identify_meter_in_worker
+from skrutable import meter_identification
 from skrutable.config import load_config_dict_from_json_file
 
 config = load_config_dict_from_json_file()
@@ -513,3 +517,278 @@ karirugṇacandanarasāruṇaṃ payaḥ // 12.49"""
 	print("\n\n%s OUTPUT:\n" % curr_func + str(truncated_output) + '\n\nSCORE: ' + str(object_result.identification_score) + '\n\n' )
 	expected_output = "udgatā"
 	assert truncated_output == expected_output
+
+def test_identify_meter_many_jobs():
+	input_strings = [
+		"dharmakṣetre kurukṣetre samavetā yuyutsavaḥ / māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya //",
+		"sampūrṇakumbho na karoti śabdam / ardho ghaṭo ghoṣamupaiti nūnam / vidvānkulīno na karoti garvaṃ / jalpanti mūḍhāstu guṇairvihīnāḥ",
+		"",
+		] * 3
+	MI = MeterIdentifier()
+	expected_output = [
+		MI.identify_meter(s, from_scheme='IAST', resplit_option='resplit_max').meter_label
+		for s in input_strings
+		]
+	output = [
+		V.meter_label for V in MI.identify_meter_many(
+			input_strings, jobs=2, chunksize=2,
+			from_scheme='IAST', resplit_option='resplit_max'
+			)
+		]
+	assert output == expected_output
+
+
+def test_resplit_weights_matches_rescanning():
+	S = Scanner()
+	V = S.scan("yadA yadA hi Darmasya glAnirBavati BArata aByutTAnamaDarmasya tadAtmAnaM sfjAmyaham", from_scheme='SLP')
+	syllable_list = V.text_syllabified.split(' ')[:-1]
+	weight_variants = S.scan_syllable_weight_variants(syllable_list)
+	morae_sums = [0]
+	for weight in weight_variants[0]:
+		morae_sums.append( morae_sums[-1] + (2 if weight == 'g' else 1) )
+	MI = MeterIdentifier()
+	span_memo = {} # shared across all resplits
+	n = len(syllable_list)
+	for pos_ab in range(-3, n + 3, 2):
+		for pos_bc in range(-3, n + 3, 3):
+			for pos_cd in range(-3, n + 3, 2):
+				expected_weights = S.scan_syllable_weights(
+					MI.resplit_Verse(syllable_list, pos_ab, pos_bc, pos_cd) )
+				weights_by_pAda, morae_by_pAda, gaRas_by_pAda = MI.resplit_weights(
+					weight_variants, morae_sums, pos_ab, pos_bc, pos_cd, span_memo)
+				assert '\n'.join(weights_by_pAda) == expected_weights
+				assert morae_by_pAda == S.count_morae(expected_weights)
+				assert gaRas_by_pAda == [ S.gaRa_abbreviate(w) for w in expected_weights.split('\n') ]
+
+def test_memos_match_fresh_results(monkeypatch):
+	import random
+	from skrutable.scansion import Verse
+	random.seed(15)
+	def random_weights(morae):
+		weights = ''
+		while morae > 0:
+			weights += 'g' if morae > 1 and random.random() < 0.5 else 'l'
+			morae -= 2 if weights[-1] == 'g' else 1
+		return weights
+	weights_list = []
+	jAti_morae = sorted(meter_identification.jAti_morae_by_pAda)
+	for i in range(300):
+		if i % 3 == 0: # near jāti morae, some exact
+			morae = [ m + random.choice([0, 0, 1, -2]) for m in random.choice(jAti_morae) ]
+			weights_list.append( '\n'.join( random_weights(m) for m in morae ) )
+		else: # repeated pādas of various lengths, some anuṣṭubh-like, some samavṛtta-like
+			pAdas = [ ''.join( random.choice('lg') for _ in range(random.choice([7, 8, 9, 11, 12])) )
+				for _ in range(2) ]
+			weights_list.append( '\n'.join( [random.choice(pAdas) for _ in range(4)] ) )
+	def identify(VT, weights):
+		V = Verse()
+		V.syllable_weights = weights
+		success = VT.attempt_identification_by_tests(V)
+		return (success, V.meter_label, V.identification_score)
+
+	# VerseTester label memos, reused across Verses and repeated (i.e. with hits)
+	VT = VerseTester()
+	results_memo = [ identify(VT, w) for w in weights_list * 2 ]
+	assert len(VT.anuzwuB_half_labels) > 0 and len(VT.samavftta_pAda_labels) > 0
+	results_fresh = [ identify(VerseTester(), w) for w in weights_list * 2 ]
+	assert results_memo == results_fresh
+
+	# test_as_jAti() early exit
+	assert any( result[2] == meter_scores["jāti, perfect"] for result in results_fresh )
+	class AnyMorae(object):
+		def __contains__(self, morae): return True
+	monkeypatch.setattr(meter_identification, 'jAti_morae_by_pAda', AnyMorae())
+	results_no_exit = [ identify(VerseTester(), w) for w in weights_list ]
+	assert results_no_exit == results_fresh[:len(weights_list)]
+
+	# span memo, shared across resplits (i.e. with hits)
+	S = Scanner()
+	syllable_list = [ 'ka' if w == 'l' else 'kA' for w in weights_list[1].replace('\n', '') ]
+	MI = MeterIdentifier()
+	weight_variants, morae_sums, span_memo = MI.prepare_resplits(syllable_list)
+	n = len(syllable_list)
+	for repeat in range(2):
+		for pos_ab in range(0, n, 3):
+			for pos_bc in range(pos_ab, n, 3):
+				for pos_cd in range(pos_bc, n, 3):
+					assert MI.resplit_weights(
+						weight_variants, morae_sums, pos_ab, pos_bc, pos_cd, span_memo
+						) == MI.resplit_weights(
+						weight_variants, morae_sums, pos_ab, pos_bc, pos_cd
+						)
+		if repeat == 0: span_memo_size = len(span_memo)
+	assert len(span_memo) == span_memo_size > 0
+
+def test_gaRa_indexes_match_regexes():
+	import itertools, re
+	from skrutable import meter_patterns
+	from skrutable.scansion import Verse
+	S = Scanner()
+	for family_len in range(1, 15):
+		for weights in itertools.product('lg', repeat=family_len):
+			gaRas = S.gaRa_abbreviate(''.join(weights))
+			expected = None
+			for gaRa_pattern in meter_patterns.samavfttas_by_family_and_gaRa[family_len].keys():
+				if re.match(gaRa_pattern, gaRas):
+					expected = gaRa_pattern
+					break
+			assert meter_patterns.samavftta_gaRa_index[family_len].get(gaRas) == expected
+
+	odd_even_regex_tuples = list(meter_patterns.ardhasamavftta_by_odd_even_regex_tuple.keys())
+	gaRa_strings = set()
+	for (odd_pattern, even_pattern) in odd_even_regex_tuples:
+		for gaRas in meter_patterns.expand_gaRa_pattern(odd_pattern) + meter_patterns.expand_gaRa_pattern(even_pattern):
+			for suffix in ['', 'g', 'l', 'y']:
+				gaRa_strings.add(gaRas + suffix)
+				gaRa_strings.add(gaRas[:-1] + suffix)
+	VT = VerseTester()
+	for odd_gaRas in gaRa_strings:
+		for even_gaRas in gaRa_strings:
+			expected = None
+			for (odd_pattern, even_pattern) in odd_even_regex_tuples:
+				if re.match(odd_pattern, odd_gaRas) and re.match(even_pattern, even_gaRas):
+					expected = meter_patterns.ardhasamavftta_by_odd_even_regex_tuple[(odd_pattern, even_pattern)]
+					break
+			V = Verse()
+			V.syllable_weights = ""
+			V.gaRa_abbreviations = '\n'.join([odd_gaRas, even_gaRas, odd_gaRas, even_gaRas])
+			VT.evaluate_ardhasamavftta(V)
+			if expected != None:
+				assert V.meter_label == expected
+			else:
+				assert V.meter_label.startswith("ajñātārdhasamavṛtta")
+
+def test_anuzwuB_half_table_matches_regexes():
+	VT = VerseTester()
+	for packed_weights in range(2**16):
+		weights = format(packed_weights, '016b').replace('0', 'l').replace('1', 'g')
+		assert VT.Scanner.pack_syllable_weights(weights) == packed_weights
+		assert (
+			VT.test_as_anuzwuB_half(weights[:8], weights[8:]) ==
+			VT.test_as_anuzwuB_half_by_regex(weights[:8], weights[8:])
+			)
+	assert VT.test_as_anuzwuB_half('glgglggg', 'glgglglg') == 'pathyā'
+	assert VT.test_as_anuzwuB_half('glgglgg', 'glgglglg') == None
+
+def test_resplit_fast_matches_resplit_max():
+	input_strings = [
+		"dharmakṣetre kurukṣetre samavetā yuyutsavaḥ māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya",
+		"sampūrṇakumbho na karoti śabdam ardho ghaṭo ghoṣamupaiti nūnam vidvānkulīno na karoti garvaṃ jalpanti mūḍhāstu guṇairvihīnāḥ",
+		"yā kundendutuṣārahāradhavalā yā śubhravastrāvṛtā yā vīṇāvaradaṇḍamaṇḍitakarā yā śvetapadmāsanā",
+		"rāmo rājamaṇiḥ sadā vijayate",
+		"",
+		]
+	MI = MeterIdentifier()
+	for input_string in input_strings:
+		for resplit_keep_midpoint in [True, False]:
+			results = [
+				MI.identify_meter(input_string, from_scheme='IAST',
+					resplit_option=resplit_option,
+					resplit_keep_midpoint=resplit_keep_midpoint)
+				for resplit_option in ['resplit_max', 'resplit_fast']
+				]
+			assert results[0].meter_label == results[1].meter_label
+			assert results[0].identification_score == results[1].identification_score
+			assert results[0].syllable_weights == results[1].syllable_weights
+			assert results[0].text_syllabified == results[1].text_syllabified
+
+def test_Verses_found_bounded_best_first():
+	MI = MeterIdentifier()
+	input_string = "sampūrṇakumbho na karoti śabdam ardho ghaṭo ghoṣamupaiti nūnam vidvānkulīno na karoti garvaṃ jalpanti mūḍhāstu guṇairvihīnāḥ"
+	result = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='resplit_max')
+	assert 0 < len(MI.Verses_found) <= resplit_candidates_kept
+	assert all( isinstance(c, ResplitCandidate) for c in MI.Verses_found )
+	ranks = [ c.rank() for c in MI.Verses_found ]
+	assert ranks == sorted(ranks, reverse=True)
+	assert result.meter_label == MI.Verses_found[0].meter_label
+	assert result.weights_by_pAda == tuple(MI.Verses_found[0].weights_by_pAda)
+
+def test_identification_memo():
+	MI = MeterIdentifier()
+	input_string = "dharmakṣetre kurukṣetre\nsamavetā yuyutsavaḥ\nmāmakāḥ pāṇḍavāś caiva\nkim akurvata sañjaya"
+	result_1 = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='none')
+	result_2 = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='none')
+	assert result_1.meter_label == result_2.meter_label
+	assert result_1.identification_score == result_2.identification_score
+	stats = MI.identification_memo.stats()
+	assert stats['hits'] == 1 and stats['misses'] == 1 and stats['size'] == 1
+	# least recently used dropped first
+	memo = IdentificationMemo(maxsize=2)
+	memo.put('a', 1); memo.put('b', 2); memo.get('a'); memo.put('c', 3)
+	assert memo.get('b') == None and memo.get('a') == 1 and memo.get('c') == 3
+
+def test_identify_meter_in_worker_reuses_memo():
+	input_string = "dharmakṣetre kurukṣetre\nsamavetā yuyutsavaḥ\nmāmakāḥ pāṇḍavāś caiva\nkim akurvata sañjaya"
+	kwargs = {'from_scheme': 'IAST', 'resplit_option': 'none'}
+	result_1 = identify_meter_in_worker( (input_string, kwargs) )
+	MI = meter_identification.worker_MeterIdentifier
+	hits_before = MI.identification_memo.stats()['hits']
+	result_2 = identify_meter_in_worker( (input_string, kwargs) )
+	assert meter_identification.worker_MeterIdentifier is MI
+	assert MI.identification_memo.stats()['hits'] == hits_before + 1
+	assert result_1.meter_label == result_2.meter_label
+
+def test_resplit_option_auto():
+	MI = MeterIdentifier()
+	# already well split: same as none, no resplits tried
+	input_string = "dharmakṣetre kurukṣetre\nsamavetā yuyutsavaḥ\nmāmakāḥ pāṇḍavāś caiva\nkim akurvata sañjaya"
+	result_none = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='none')
+	result_auto = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='auto')
+	assert result_auto.meter_label == result_none.meter_label
+	assert result_auto.identification_score == meter_scores["max score"]
+	assert result_auto.identification_candidate_count == 1
+	# badly split: falls through to resplitting
+	input_string = "dharmakṣetre kurukṣetre samavetā yuyu\ntsavaḥ māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya"
+	result_max = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='resplit_max')
+	result_auto = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='auto')
+	assert result_auto.meter_label == result_max.meter_label
+	assert result_auto.identification_score == meter_scores["max score"]
+
+def test_profile_resplits_matches_resplit_weights():
+	S = Scanner()
+	V = S.scan("yadA yadA hi Darmasya glAnirBavati BArata aByutTAnamaDarmasya tadAtmAnaM sfjAmyaham", from_scheme='SLP')
+	syllable_list = V.text_syllabified.split(' ')[:-1]
+	MI = MeterIdentifier()
+	resplit_data = MI.prepare_resplits(syllable_list)
+	n = len(syllable_list)
+	pAda_brs_triples = [
+		(pos_ab, pos_bc, pos_cd)
+		for pos_ab in range(-3, n + 3, 2)
+		for pos_bc in range(-3, n + 3, 3)
+		for pos_cd in range(-3, n + 3, 2)
+		]
+	pAda_lens, morae_by_pAda = MI.profile_resplits(resplit_data, pAda_brs_triples)
+	for i, (pos_ab, pos_bc, pos_cd) in enumerate(pAda_brs_triples):
+		weights_by_pAda, expected_morae, gaRas_by_pAda = MI.resplit_weights(
+			*resplit_data[:2], pos_ab, pos_bc, pos_cd)
+		assert pAda_lens[i].tolist() == [ len(w) for w in weights_by_pAda ]
+		assert morae_by_pAda[i].tolist() == expected_morae
+
+def test_identify_meter_budget():
+	input_string = "dharmakṣetre kurukṣetre samavetā yuyutsavaḥ māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya"
+	MI = MeterIdentifier()
+
+	V = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='resplit_max')
+	assert V.identification_partial == False
+	assert V.identification_score == meter_scores["max score"]
+
+	V = MI.identify_meter(input_string, from_scheme='IAST', resplit_option='resplit_max',
+		max_candidates=1000)
+	assert V.identification_partial == False
+	assert V.identification_score == meter_scores["max score"]
+	assert V.identification_candidate_count <= 1000
+
+	input_string = "sampūrṇakumbho na karoti śabdam ardho ghaṭo ghoṣamupaiti nūnam vidvānkulīno na karoti garvaṃ jalpanti"
+	for resplit_option in ['resplit_max', 'resplit_fast']:
+		V = MI.identify_meter(input_string, from_scheme='IAST', resplit_option=resplit_option,
+			max_candidates=3)
+		assert V.identification_partial == True
+		assert V.identification_candidate_count == 3
+		assert V.meter_label in V.summarize()
+		assert "(? 3 vikalpāḥ eva parīkṣitāḥ)" in V.summarize()
+
+		V = MI.identify_meter(input_string, from_scheme='IAST', resplit_option=resplit_option,
+			time_budget_ms=0)
+		assert V.identification_partial == True
+		assert V.identification_candidate_count == 0
+		assert V.meter_label == 'na kiṃcid adhyavasitam'
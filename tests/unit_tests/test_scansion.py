@@ -1,4 +1,5 @@
 from skrutable.scansion import Scanner
+from skrutable import phonemes
 import inspect
 
 # def test_Verse_summarize_Darmakzetre_IAST():
@@ -38,3 +39,82 @@ kim akurvata sañjaya //"""
 
 # def ():
 # 	assert expected_output == output
+
+def test_char_classes_match_phoneme_lists():
+	for c in set(phonemes.SLP_chars + phonemes.DEV_chars + phonemes.BENGALI_chars + phonemes.GUJARATI_chars + phonemes.IAST_chars):
+		char_class = phonemes.char_classes[ord(c)]
+		assert bool(char_class & phonemes.flag_vowel) == (c in phonemes.SLP_vowels)
+		assert bool(char_class & phonemes.flag_long_vowel) == (c in phonemes.SLP_long_vowels)
+		assert bool(char_class & phonemes.flag_consonant) == (c in phonemes.SLP_consonants_for_scansion)
+		assert bool(char_class & (phonemes.flag_consonant | phonemes.flag_indic_consonant)) == (c in phonemes.SLP_and_indic_consonants)
+		assert bool(char_class & phonemes.flag_anusvAra_visarga) == (c in ['M', 'H'])
+		assert bool(char_class & phonemes.flag_virAma) == (c in phonemes.virAmas.values())
+	assert phonemes.char_classes[0x1F600] == 0 # beyond Basic Multilingual Plane
+
+def test_clean_input():
+	S = Scanner()
+	input_string = "\n 1.1 dharmakṣetre kurukṣetre; samavetā yuyutsavaḥ /\n\r\n\r\nmāmakāḥ pāṇḍavāś caiva | kim akurvata sañjaya // ✓ \n"
+	output = S.clean_input(input_string, 'IAST')
+	expected_output = " dharmakṣetre kurukṣetre\n samavetā yuyutsavaḥ \nmāmakāḥ pāṇḍavāś caiva\nkim akurvata sañjaya  "
+	assert output == expected_output
+
+def test_clean_input_interior_newline_runs():
+	S = Scanner()
+	# long interior runs once made edge-whitespace matching backtrack exponentially
+	input_string = "yadā yadā hi dharmasya" + "\n" * 40 + "glānir bhavati bhārata"
+	assert S.clean_input(input_string, 'IAST') == "yadā yadā hi dharmasya\nglānir bhavati bhārata"
+	input_string = "a" + "\n \n" * 40 + "b"
+	assert S.clean_input(input_string, 'IAST') == "a" + "\n " * 40 + "\nb"
+
+def test_scan_weights_matches_scan():
+	S = Scanner()
+	input_string = "yadā yadā hi dharmasya glānir bhavati bhārata /\nabhyutthānam adharmasya tadātmānaṃ sṛjāmy aham //"
+	V = S.scan(input_string, from_scheme='IAST')
+	assert S.scan_weights(input_string, from_scheme='IAST') == V.syllable_weights
+	assert V.syllable_weights == "lglglggggglllgll\ngggllggllggglglg"
+	assert V.morae_per_line == [24, 26]
+	assert V.gaRa_abbreviations == "jrmBjl\nmsBmjg"
+
+def test_syllabify_line():
+	S = Scanner()
+	assert S.syllabify_line("tadAtmAnaM sfjAmyaham") == (
+		"ta dA tmA naM sf jA mya ham ", ['ta', 'dA', 'tmA', 'naM', 'sf', 'jA', 'mya', 'ham']
+		)
+	assert S.syllabify_line("rc") == ("rc ", ['rc']) # consonants only
+	assert S.syllabify_line("") == ("", [])
+
+def test_scan_SLP_corpus_matches_scan_syllable_weights():
+	S = Scanner()
+	input_strings = [
+		"yadA yadA hi Darmasya glAnir Bavati BArata\naByutTAnam aDarmasya tadAtmAnaM sfjAmyaham",
+		"sampUrRakumBo na karoti Sabdam\narDo Gawo GozamupEti nUnam\n\nvidvAnkulIno na karoti garvaM\njalpanti mUQAstu guREvihInAH",
+		"kaH\nam\nrc\n\nMa aMH kft",
+		"",
+		]
+	for input_string in input_strings:
+		offsets, weights, morae_by_line = S.scan_SLP_corpus(input_string)
+		expected_weights = S.scan_syllable_weights(S.syllabify_text(input_string))
+		output_weights = '\n'.join(
+			''.join( 'g' if w else 'l' for w in weights[offsets[i]:offsets[i+1]] )
+			for i in range(len(offsets) - 1)
+			)
+		assert output_weights == expected_weights
+		assert list(morae_by_line) == S.count_morae(expected_weights)
+
+def test_Verse_derived_fields_and_lean():
+	S = Scanner()
+	input_string = "yadA yadA hi Darmasya glAnir Bavati BArata\naByutTAnam aDarmasya tadAtmAnaM sfjAmyaham"
+	V = S.scan(input_string, from_scheme='SLP')
+	assert V.weights_by_pAda == ("lglglggggglllgll", "gggllggllggglglg")
+	assert V.morae_per_line == S.count_morae(V.syllable_weights)
+	assert V.gaRa_abbreviations == '\n'.join(
+		[ S.gaRa_abbreviate(w) for w in V.weights_by_pAda ] )
+	summary = V.summarize()
+	V.syllable_weights = "gg\nll" # derived fields follow
+	assert V.morae_per_line == [4, 2]
+	assert V.gaRas_by_pAda == ("gg", "ll")
+	assert V.summarize(show_alignment=False).startswith("gg    {m: 4}    [2: gg]\n")
+	V_lean = S.scan(input_string, from_scheme='SLP', lean=True)
+	assert V_lean.text_cleaned == V_lean.text_SLP == V_lean.text_syllabified == None
+	assert V_lean.summarize() == S.scan(input_string, from_scheme='SLP').summarize(show_alignment=False)
+	assert summary != V_lean.summarize()
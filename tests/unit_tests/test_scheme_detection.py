@@ -0,0 +1,48 @@
+from skrutable.scheme_detection import SchemeDetector
+from skrutable import scheme_detection
+from skrutable import scheme_vectors_mbh
+
+def test_detect_scheme_IAST():
+	input = "dharmakṣetre kurukṣetre samavetā yuyutsavaḥ"
+	SD = SchemeDetector()
+	output = SD.detect_scheme(input)
+	expected_output = "IAST"
+	assert expected_output == output
+
+def test_detect_scheme_DEV():
+	input = "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः"
+	SD = SchemeDetector()
+	output = SD.detect_scheme(input)
+	expected_output = "DEV"
+	assert expected_output == output
+
+def test_score_schemes_matches_cosine_similarity():
+	input = "mAmakAH pARqavAS cEva kim akurvata saYjaya"
+	SD = SchemeDetector()
+	file_vector = SD.fingerprint(input)
+	output = SD.score_schemes(file_vector)
+	for i, scheme in enumerate(scheme_detection.scheme_names):
+		expected_output = SD.cosine_similarity(file_vector, scheme_vectors_mbh.all[scheme])
+		assert abs(expected_output - output[i]) < 1e-5
+
+def test_detect_scheme_early_exit_DEV():
+	# decisive from first sample on, rest never counted
+	input = "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः\n" * 1000 + "dharmakṣetre " * 100000
+	SD = SchemeDetector()
+	output = SD.detect_scheme_early_exit(input, initial_sample_size=100)
+	expected_output = "DEV"
+	assert expected_output == output[0]
+	assert output[1] >= scheme_detection.confidence_margin
+
+def test_detect_many_matches_detect_scheme():
+	input = [
+		"dharmakṣetre kurukṣetre samavetā yuyutsavaḥ",
+		"धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः",
+		"mAmakAH pARqavAS cEva kim akurvata saYjaya",
+		"",
+		]
+	SD = SchemeDetector()
+	output, scores = SD.detect_many(input)
+	expected_output = [ SD.detect_scheme(text) for text in input ]
+	assert expected_output == output
+	assert scores.shape == (len(input), len(scheme_detection.scheme_names))
@@ -1,4 +1,8 @@
 from skrutable.transliteration import Transliterator
+from skrutable.transliteration import build_pipeline
+from skrutable import transliteration
+from skrutable import virAma_avoidance
+import re
 from skrutable import scheme_maps
 
 def test_mapping_mAmakAH():
@@ -21,5 +25,110 @@ def test_linear_preprocessing_cAtura():
 	expected_output = "चातुरa"
 	assert expected_output == output
 
+def test_linear_preprocessing_kEvalyam():
+	input = "kEvalyam akza\nrAjYaH"
+	T = Transliterator()
+	T.contents = input
+	T.linear_preprocessing(from_scheme='SLP', to_scheme='DEV')
+	output = T.contents
+	print("\n\n test_linear_preprocessing_kEvalyam OUTPUT: " + output + '\n\n')
+	expected_output = "kैvl्ym् ak्z\nrाj्YH"
+	assert expected_output == output
+
+def test_compile_map_matches_sequential_replace():
+	for map_name, map in scheme_maps.by_name.items():
+		# dense mix of all map characters to provoke bleeding/feeding
+		chars = sorted(set(''.join(char_in + char_out for (char_in, char_out) in map)))
+		input = ' '.join(''.join(chars[i:] + chars[:i]) for i in range(len(chars)))
+		input += ' ' + ''.join(char_in for (char_in, char_out) in map)
+		expected_output = input
+		for (char_in, char_out) in map:
+			expected_output = expected_output.replace(char_in, char_out)
+		T = Transliterator()
+		T.contents = input
+		T.map_replace(*map_name.split('_'))
+		output = T.contents
+		assert expected_output == output, map_name
+
+def test_direct_pipelines_match_hub_path():
+	input_IAST = """dharmakṣetre kurukṣetre samavetā yuyutsavaḥ /
+māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya // 1.1
+Ṛṣayaḥ ḷkāra aiśvaryam auṣadhaṃ ghṛtaṃ jhaṭiti ’dya chinnā kḥ gṅ dhṭh"""
+	schemes = ['IAST', 'SLP', 'HK', 'DEV', 'BENGALI', 'GUJARATI', 'VH', 'WX', 'ITRANS']
+	for scheme_in in schemes:
+		T = Transliterator()
+		input = T.transliterate(input_IAST, from_scheme='IAST', to_scheme=scheme_in)
+		for scheme_out in schemes + ['IASTREDUCED']:
+			for avoid_virAma in [True, False]:
+				T.contents = input
+				T.run_pipeline(build_pipeline(scheme_in, scheme_out, avoid_virAma, fuse=False))
+				expected_output = T.contents
+				T.contents = input
+				T.run_pipeline(build_pipeline(scheme_in, scheme_out, avoid_virAma))
+				output = T.contents
+				assert expected_output == output, (scheme_in, scheme_out, avoid_virAma)
+
+def test_transliterate_stream_matches_transliterate(monkeypatch):
+	input = """dharmakṣetre kurukṣetre samavetā yuyutsavaḥ /
+māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya //
+tapaḥsvādhyāyanirataṃ tapasvī vāgvidāṃ varam
+nāradaṃ paripapraccha vālmīkir munipuṃgavam"""
+	for scheme_out in ['DEV', 'HK', 'SLP']:
+		expected_output = Transliterator().transliterate(input, 'IAST', scheme_out)
+		for chunk_size in [1, 7, 40, 1000]:
+			monkeypatch.setattr(transliteration, 'stream_chunk_size', chunk_size)
+			chunks = [ input[i:i+chunk_size] for i in range(0, len(input), chunk_size) ]
+			T = Transliterator()
+			output = ''.join(T.transliterate_stream(chunks, 'IAST', scheme_out))
+			assert expected_output == output, (scheme_out, chunk_size)
+
+def test_get_pipeline_shared_across_Transliterators():
+	input = "dharmakṣetre kurukṣetre"
+	Transliterator().transliterate(input, from_scheme='IAST', to_scheme='BENGALI')
+	hits_before = transliteration.get_pipeline.cache_info().hits
+	output = Transliterator().transliterate(input, from_scheme='IAST', to_scheme='BENGALI')
+	expected_output = Transliterator().transliterate(
+		Transliterator().transliterate(input, 'IAST', 'SLP'), 'SLP', 'BENGALI')
+	assert transliteration.get_pipeline.cache_info().hits > hits_before
+	assert expected_output == output
+
+def test_avoid_virAmas_matches_sequential_rules():
+	# includes single-letter words, where rules interact
+	input = "tat tu vAg asti pitur a r a r ap a k k k t t Sak cid yad Bavet"
+	for replacements in [
+		virAma_avoidance.replacements,
+		virAma_avoidance.replacements[::-1], # custom rule order
+		]:
+		expected_output = input
+		for pattern in replacements:
+			expected_output = re.sub(pattern, r'\1\2', expected_output)
+		T = Transliterator()
+		T.contents = input
+		T.avoid_virAmas(transliteration.compile_virAma_avoidance(replacements))
+		output = T.contents
+		assert expected_output == output
+
+def test_avoid_virAmas_DEV_output():
+	T = Transliterator()
+	input = "tat tvam asi vāk patiḥ tat kim asti tat phalam"
+	output = T.transliterate(input, from_scheme='IAST', to_scheme='DEV')
+	expected_output = "तत् त्वमसि वाक्पतिः तत् किमस्ति तत् फलम्"
+	assert expected_output == output
+
+def test_rebuild_compiled_rules_after_custom_virAma_avoidance(monkeypatch):
+	input = "tat tvam asi"
+	T = Transliterator()
+	assert T.transliterate(input, 'IAST', 'DEV') == "तत् त्वमसि"
+	monkeypatch.setattr(virAma_avoidance, 'replacements',
+		virAma_avoidance.replacements + ['(t) (t)'])
+	try:
+		assert T.transliterate(input, 'IAST', 'DEV') == "तत् त्वमसि" # still cached
+		transliteration.rebuild_compiled_rules()
+		assert T.transliterate(input, 'IAST', 'DEV') == "तत्त्वमसि"
+	finally:
+		monkeypatch.undo()
+		transliteration.rebuild_compiled_rules()
+	assert T.transliterate(input, 'IAST', 'DEV') == "तत् त्वमसि"
+
 # def ():
 # 	assert expected_output == output
@@ -7,6 +7,7 @@ from skrutable.config import load_config_dict_from_json_file
 import json
 import re
 import os.path
+from functools import lru_cache
 
 # load config variables
 config = load_config_dict_from_json_file()
@@ -14,6 +15,313 @@ default_scheme_in = config["default_scheme_in"] # e.g. "auto"
 default_scheme_out = config["default_scheme_out"] # e.g. "IAST"
 avoid_virAma_indic_scripts = config["avoid_virAma_indic_scripts"] # e.g. True
 avoid_virAma_all_scripts = config["avoid_virAma_all_scripts"] # e.g. False
+stream_chunk_size = config["stream_chunk_size"] # e.g. 100000
+
+
+def map_pairs_conflict(earlier_pair, later_pair):
+	"""
+	Internal function.
+
+	Determines whether two (char_in, char_out) pairs from a scheme map
+	must stay in separate passes to preserve their sequential semantics,
+	i.e., whether the earlier pair could feed or bleed the later one.
+
+	Returns bool.
+	"""
+	earlier_in, earlier_out = earlier_pair
+	later_in = later_pair[0]
+
+	# feeding: earlier output could create new instance of later input
+	if set(earlier_out) & set(later_in):
+		return True
+	if earlier_out == '' and len(later_in) > 1:
+		return True
+
+	# bleeding: later input could start before and swallow earlier input
+	if later_in.find(earlier_in, 1) != -1:
+		return True
+	for n in range(1, min(len(earlier_in), len(later_in))):
+		if later_in[-n:] == earlier_in[:n]:
+			return True
+
+	return False
+
+
+def make_map_pass(lookup):
+	"""
+	Internal function.
+
+	Accepts dict of char_in: char_out, ordered by priority.
+
+	Returns single-scan map pass as tuple (regex, lookup, table):
+	if all inputs are single characters, regex is None and table is for str.translate(),
+	otherwise regex is alternation of inputs (in lookup order, so earlier ones win ties).
+	"""
+	if all(len(char_in) == 1 for char_in in lookup):
+		return (None, lookup, str.maketrans(lookup))
+	regex = re.compile('|'.join(re.escape(char_in) for char_in in lookup))
+	return (regex, lookup, None)
+
+
+def apply_map_pass(txt, map_pass):
+	"""Internal function. Returns txt with single map pass applied."""
+	regex, lookup, table = map_pass
+	if regex is None:
+		return txt.translate(table)
+	return regex.sub(lambda m: lookup[m.group(0)], txt)
+
+
+def compile_map(map):
+	"""
+	Internal function.
+
+	Groups (char_in, char_out) pairs of scheme map into as few passes as possible
+	such that each pass can be done as single left-to-right scan
+	with exactly same result as series of global str.replace() calls.
+
+	Returns list of map passes (see make_map_pass).
+	"""
+	passes = [] # list of lists of pairs
+	for pair in map:
+		if passes and not any(
+			map_pairs_conflict(earlier_pair, pair) for earlier_pair in passes[-1]
+			):
+			passes[-1].append(pair)
+		else:
+			passes.append([pair])
+
+	compiled_passes = []
+	for pairs in passes:
+		lookup = {}
+		for (char_in, char_out) in pairs:
+			lookup.setdefault(char_in, char_out) # first occurrence wins
+		compiled_passes.append(make_map_pass(lookup))
+
+	return compiled_passes
+
+
+def fuse_map_passes(first_pass, second_pass):
+	"""
+	Internal function.
+
+	Combines two consecutive map passes into one equivalent pass,
+	which is only possible if second one is single-character (str.translate) pass.
+	Since every SLP_... map has only single-character inputs,
+	this allows e.g. IAST > SLP > HK to skip a separate scan for the second hop.
+
+	Returns fused map pass, or None if not possible.
+	"""
+	if second_pass[0] is not None:
+		return None
+	second_table = second_pass[2]
+
+	# outputs of first pass are fed through second pass
+	lookup = {
+		char_in: char_out.translate(second_table)
+		for (char_in, char_out) in first_pass[1].items()
+		}
+	# characters untouched by first pass still get second pass
+	for (char_in, char_out) in second_pass[1].items():
+		lookup.setdefault(char_in, char_out)
+
+	return make_map_pass(lookup)
+
+
+def build_pipeline(scheme_in, scheme_out, avoid_virAma, fuse=True):
+	"""
+	Internal function.
+
+	Lays out transliteration from scheme_in to scheme_out via hub scheme SLP
+	as list of (step_name, step_args) tuples, where step_name is one of
+	'map_pass', 'linear_preprocessing', 'avoid_virAmas'.
+
+	With fuse=True, adjacent map passes of the two hops are precomposed where possible,
+	so that the result is a direct scheme-to-scheme pipeline.
+	With fuse=False, result corresponds exactly to the plain hub path.
+	"""
+	steps = []
+
+	def add_map_passes(map_name):
+		if map_name not in compiled_maps:
+			compiled_maps[map_name] = compile_map(scheme_maps.by_name[map_name])
+		for map_pass in compiled_maps[map_name]:
+			fused_pass = None
+			if fuse and steps and steps[-1][0] == 'map_pass':
+				fused_pass = fuse_map_passes(steps[-1][1], map_pass)
+			if fused_pass is not None:
+				steps[-1] = ('map_pass', fused_pass)
+			else:
+				steps.append(('map_pass', map_pass))
+
+	# transliterate first to hub scheme SLP
+	if scheme_in in scheme_maps.indic_schemes:
+		steps.append( ('linear_preprocessing', (scheme_in, 'SLP')) )
+	add_map_passes(scheme_in + '_SLP')
+
+	# avoid undesirable virāmas specified in virāma_avoidance.py
+	if avoid_virAma:
+		steps.append( ('avoid_virAmas', (compiled_virAma_avoidance,)) )
+
+	# then transliterate to desired scheme
+	if scheme_out in scheme_maps.indic_schemes:
+		steps.append( ('linear_preprocessing', ('SLP', scheme_out)) )
+	add_map_passes('SLP_' + scheme_out)
+
+	return steps
+
+def compile_linear_preprocessing(from_scheme, to_scheme):
+	"""
+	Internal function.
+
+	Prepares regexes for Transliterator.linear_preprocessing(),
+	each looking only at characters immediately after consonants.
+
+	Passes must run in order (addition, mātrā, deletion):
+	additions never separate a consonant from a character to be replaced,
+	and mātrā replacements must see e.g. SLP 'kai' before 'a' is deleted.
+
+	Returns tuple (addition_regex, char_to_add, mAtrA_regex, mAtrA_lookup, deletion_regex).
+	"""
+	if from_scheme in scheme_maps.indic_schemes and to_scheme == 'SLP':
+		char_to_ignore = phonemes.virAmas[from_scheme]
+		char_to_add = 'a'
+	elif from_scheme == 'SLP' and to_scheme in scheme_maps.indic_schemes:
+		char_to_ignore = 'a'
+		char_to_add = phonemes.virAmas[to_scheme]
+
+	def char_class(chars):
+		return '[' + ''.join(re.escape(c) for c in sorted(set(chars))) + ']'
+
+	after_consonant = '(?<=%s)' % char_class(
+		phonemes.chars_with_flag(phonemes.flag_consonant | phonemes.flag_indic_consonant)
+		)
+
+	# all characters needing no addition, whether kept, replaced, or deleted
+	addition_regex = re.compile(
+		after_consonant + '(?=[^%s])' % char_class(
+			phonemes.chars_with_flag(phonemes.flag_vowel | phonemes.flag_mAtrA) + char_to_ignore
+			)[1:-1],
+		re.DOTALL
+		)
+
+	# being careful of stray characters: vowels without mātrā form are deleted
+	mAtrA_lookup = {}
+	chars_to_delete = [char_to_ignore]
+	for vowel in phonemes.SLP_vowels_with_mAtrAs:
+		try:
+			mAtrA_lookup[vowel] = phonemes.vowel_mAtrA_lookup[to_scheme][vowel]
+		except KeyError:
+			chars_to_delete.append(vowel)
+
+	mAtrA_regex = None
+	if mAtrA_lookup:
+		mAtrA_regex = re.compile(after_consonant + char_class(mAtrA_lookup.keys()))
+
+	deletion_regex = re.compile(after_consonant + char_class(chars_to_delete))
+
+	return (addition_regex, char_to_add, mAtrA_regex, mAtrA_lookup, deletion_regex)
+
+# compiled regexes for Transliterator.linear_preprocessing(), built on first use
+linear_preprocessing_regexes = {}
+
+# compiled versions of scheme_maps.by_name, built on first use
+compiled_maps = {}
+
+def compile_virAma_avoidance(replacements):
+	"""
+	Internal function, also usable for custom rule lists.
+
+	Accepts list of regex strings of form '(X) (Y)' (see virAma_avoidance.py),
+	which are meant to be applied one after another, each removing the space.
+
+	Merges them into one regex finding every space that any rule could remove.
+	Which rule (if any) actually removes it is looked up per character pair,
+	with rules in list order. The only interaction between rules arises when
+	one space's right character is next space's left character (e.g. 'r a r'):
+	within one rule's pass, a match consumes that character,
+	so the next space can't be removed by the same rule, only by a later one.
+
+	Returns tuple (merged_regex, rule_regexes, rules_by_pair) for apply_virAma_avoidance().
+	"""
+	rule_regexes = []
+	lookarounds = []
+	for pattern in replacements:
+		m = re.fullmatch(r'\((.+)\) \((.+)\)', pattern)
+		if m == None:
+			raise ValueError("virāma avoidance rule not of form '(X) (Y)': %s" % pattern)
+		rule_regexes.append(re.compile(pattern))
+		lookarounds.append('(?<=%s) (?=%s)' % m.groups())
+
+	merged_regex = re.compile('|'.join(lookarounds))
+	rules_by_pair = {} # cache of (char, char): tuple of indices of matching rules
+
+	return (merged_regex, rule_regexes, rules_by_pair)
+
+
+def apply_virAma_avoidance(txt, compiled_avoidance):
+	"""
+	Internal function.
+
+	Returns txt with virāma-avoiding space removals (see compile_virAma_avoidance)
+	applied in single left-to-right pass.
+	"""
+	merged_regex, rule_regexes, rules_by_pair = compiled_avoidance
+
+	prev_space = [-2, None] # position of previous candidate space, index of rule removing it
+
+	def remove_space(m):
+		pos = m.start()
+		pair = (txt[pos-1], txt[pos+1])
+		if pair not in rules_by_pair:
+			rules_by_pair[pair] = tuple(
+				i for i, regex in enumerate(rule_regexes)
+				if regex.fullmatch(pair[0] + ' ' + pair[1])
+				)
+
+		# rule that removed immediately preceding space consumed left character
+		blocked_rule = prev_space[1] if prev_space[0] == pos - 2 else None
+
+		removing_rule = None
+		for i in rules_by_pair[pair]:
+			if i != blocked_rule:
+				removing_rule = i
+				break
+
+		prev_space[0], prev_space[1] = pos, removing_rule
+		if removing_rule == None:
+			return ' '
+		return ''
+
+	return merged_regex.sub(remove_space, txt)
+
+# compiled version of virAma_avoidance.replacements
+compiled_virAma_avoidance = compile_virAma_avoidance(virAma_avoidance.replacements)
+
+@lru_cache(maxsize=256)
+def get_pipeline(scheme_in, scheme_out, avoid_virAma):
+	"""
+	Internal function.
+
+	Returns direct pipeline for scheme pair (see build_pipeline),
+	from cache shared by all Transliterator objects,
+	so that e.g. every Scanner.scan() and Verse.summarize() can reuse it.
+	"""
+	return build_pipeline(scheme_in, scheme_out, avoid_virAma)
+
+def rebuild_compiled_rules():
+	"""
+	User-facing function.
+
+	Compiled maps, virāma avoidance, and pipelines are built only once
+	from scheme_maps and virAma_avoidance.replacements, then cached,
+	so that runtime edits to those (e.g. customizing virāma avoidance rules)
+	take effect only after calling this.
+	"""
+	global compiled_virAma_avoidance
+	compiled_maps.clear()
+	linear_preprocessing_regexes.clear()
+	compiled_virAma_avoidance = compile_virAma_avoidance(virAma_avoidance.replacements)
+	get_pipeline.cache_clear()
 
 
 class Transliterator():
@@ -42,33 +350,43 @@ class Transliterator():
 
 
 	def set_detected_scheme(self):
-		"""Internal method."""
+		"""
+		Internal method.
+
+		Uses early-exit detection, so that large input costs no more than a sample.
+		"""
 		SD = SchemeDetector()
-		self.scheme_in = SD.detect_scheme(self.contents)
+		self.scheme_in, confidence = SD.detect_scheme_early_exit(self.contents)
 
 	def map_replace(self, from_scheme, to_scheme):
 		"""
 		Internal method.
 
-		Performs simple series of global regex replacements for transliteration.
+		Performs simple series of global replacements for transliteration,
+		compiled into as few left-to-right passes as possible (see compile_map).
 
 		Result returned via updated self.contents.
 		"""
-		map = scheme_maps.by_name[from_scheme + '_' + to_scheme]
-		for (char_in, char_out) in map:
-			self.contents = self.contents.replace(char_in, char_out)
+		map_name = from_scheme + '_' + to_scheme
+		if map_name not in compiled_maps:
+			compiled_maps[map_name] = compile_map(scheme_maps.by_name[map_name])
+		for map_pass in compiled_maps[map_name]:
+			self.contents = apply_map_pass(self.contents, map_pass)
 
 
-	def avoid_virAmas(self):
+	def avoid_virAmas(self, compiled_avoidance=None):
 		"""
 		Internal method.
 
-		Performs simple series of global regex replacements for avoiding virāma.
+		Removes spaces to avoid virāma in single pass equivalent to
+		simple series of global regex replacements (see compile_virAma_avoidance),
+		by default with precompiled virAma_avoidance.replacements.
 
 		Result returned via updated self.contents.
 		"""
-		for pattern in virAma_avoidance.replacements:
-			self.contents = re.sub(pattern, r'\1\2', self.contents)
+		if compiled_avoidance == None:
+			compiled_avoidance = compiled_virAma_avoidance
+		self.contents = apply_virAma_avoidance(self.contents, compiled_avoidance)
 
 	def linear_preprocessing(self, from_scheme, to_scheme):
 		"""
@@ -79,58 +397,49 @@ class Transliterator():
 
 		Also manages distinction between initial and mātrā vowel forms.
 
+		Done as few precompiled regex passes (see compile_linear_preprocessing)
+		rather than character by character.
+
 		Indic-SLP hybrid result returned via updated self.contents,
 		to be further processed by simple map replacement.
 		"""
 
-		if from_scheme in scheme_maps.indic_schemes and to_scheme == 'SLP':
-			char_to_ignore = phonemes.virAmas[from_scheme]
-			char_to_add = 'a'
-		elif from_scheme == 'SLP' and to_scheme in scheme_maps.indic_schemes:
-			char_to_ignore = 'a'
-			char_to_add = phonemes.virAmas[to_scheme]
-		else: return
-
-		content_in = self.contents
-
-		content_out = '' # buffer to build as hybrid mix
-		prev_char = ''
-		for curr_char in content_in:
-
-			if prev_char in phonemes.SLP_and_indic_consonants:
-				# only need special action after consonants
-
-				if curr_char == char_to_ignore:
-					# from DEV: virāma
-					# from SLP: 'a'
-					pass
+		if not (
+			from_scheme in scheme_maps.indic_schemes and to_scheme == 'SLP'
+			or from_scheme == 'SLP' and to_scheme in scheme_maps.indic_schemes
+			):
+			return
 
-				elif curr_char not in phonemes.vowels_that_preempt_virAma:
-					# from Indic: not vowel mātrā, therefore need 'a'
-					# from SLP: not vowel, therefore need virāma
-					# could also be other things (e.g. vowel, whitesp., punct.)
-					content_out += char_to_add + curr_char
+		key = (from_scheme, to_scheme)
+		if key not in linear_preprocessing_regexes:
+			linear_preprocessing_regexes[key] = compile_linear_preprocessing(*key)
+		( addition_regex, char_to_add,
+		  mAtrA_regex, mAtrA_lookup,
+		  deletion_regex ) = linear_preprocessing_regexes[key]
 
-				elif curr_char in phonemes.SLP_vowels_with_mAtrAs:
-					# from SLP: any vowel except 'a', therefore need mātrā
-					try: # being careful of stray characters
-						content_out += phonemes.vowel_mAtrA_lookup[to_scheme][curr_char]
-					except KeyError: pass
+		content_in = self.contents
 
-				elif curr_char in phonemes.vowels_that_preempt_virAma:
-					# from Indic: vowel mātrā (only possibility left)
-					content_out += curr_char
+		# from Indic: not vowel mātrā, therefore need 'a'
+		# from SLP: not vowel, therefore need virāma
+		# could also be other things (e.g. vowel, whitesp., punct.)
+		content_out = addition_regex.sub(char_to_add, content_in)
 
-			else:
-				# whenever preceding is non-consonant (e.g. vowel, whitesp., punct.)
-				content_out += curr_char
+		# from SLP: any vowel except 'a', therefore need mātrā
+		if mAtrA_regex is not None:
+			content_out = mAtrA_regex.sub(
+				lambda m: mAtrA_lookup[m.group(0)], content_out
+				)
 
-			prev_char = curr_char
+		# from DEV: virāma
+		# from SLP: 'a'
+		# also stray characters (e.g. SLP vowel after Indic consonant)
+		content_out = deletion_regex.sub('', content_out)
 
-		if prev_char in phonemes.SLP_consonants:
+		prev_char_class = phonemes.char_classes[ord(content_in[-1])] if content_in else 0
+		if prev_char_class & phonemes.flag_consonant:
 			# line-final SLP consonant: final virāma needed
 			content_out += phonemes.virAmas[to_scheme]
-		elif prev_char in phonemes.SLP_and_indic_consonants:
+		elif prev_char_class & phonemes.flag_indic_consonant:
 			# line-final Indic consonant: final 'a' needed
 			content_out += 'a'
 
@@ -148,7 +457,8 @@ class Transliterator():
 		and fixed output scheme is chosen by default (see config.json).
 
 		Executes transliteration via SLP,
-		including linear preprocessing in case of DEV.
+		including linear preprocessing in case of DEV,
+		using cached precomposed direct pipeline for scheme pair (see get_pipeline).
 
 		Result returned via updated self.contents
 		and also directly as string.
@@ -169,18 +479,81 @@ class Transliterator():
 		if self.scheme_in in scheme_detection.auto_detect_synonyms:
 			self.set_detected_scheme()
 
-		# transliterate first to hub scheme SLP
-		self.linear_preprocessing(self.scheme_in, 'SLP')
-		self.map_replace(self.scheme_in, 'SLP')
-
-		# avoid undesirable virāmas specified in virāma_avoidance.py
-		if 	(self.scheme_out in scheme_maps.indic_schemes
+		avoid_virAma = (
+			self.scheme_out in scheme_maps.indic_schemes
 			and avoid_virAma_indic_scripts == True
-			or avoid_virAma_all_scripts == True):
-			self.avoid_virAmas()
+			or avoid_virAma_all_scripts == True
+			)
 
-		# then transliterate to desired scheme
-		self.linear_preprocessing('SLP', self.scheme_out)
-		self.map_replace('SLP', self.scheme_out)
+		self.run_pipeline(get_pipeline(self.scheme_in, self.scheme_out, avoid_virAma))
 
 		return self.contents
+
+	def run_pipeline(self, steps):
+		"""
+		Internal method.
+
+		Executes list of steps as laid out by build_pipeline().
+
+		Result returned via updated self.contents.
+		"""
+		for (step_name, step_args) in steps:
+			if step_name == 'map_pass':
+				self.contents = apply_map_pass(self.contents, step_args)
+			elif step_name == 'linear_preprocessing':
+				self.linear_preprocessing(*step_args)
+			elif step_name == 'avoid_virAmas':
+				self.avoid_virAmas(*step_args)
+
+	def transliterate_stream(self, lines, from_scheme=None, to_scheme=None):
+		"""
+		User-facing method.
+
+		Like transliterate(), but accepts any iterable of strings
+		(e.g. open file object, list of lines, or arbitrary chunks)
+		and lazily yields transliterated strings, for arbitrarily large input.
+
+		Since no part of transliteration (map tokens, virāma handling,
+		virāma avoidance) reaches across a newline,
+		input is only ever cut directly after newlines,
+		once at least stream_chunk_size characters have accumulated (see config.json),
+		and everything after the last newline is carried over.
+		Memory use is therefore bounded by chunk size plus longest line.
+
+		If input scheme is to be auto-detected,
+		this is done only once, on the first such chunk.
+		"""
+
+		if from_scheme == "IASTREDUCED":
+			for chunk in lines:
+				yield chunk
+			return
+
+		# uppercase
+		if from_scheme != None:
+			self.scheme_in = from_scheme.upper()
+		if to_scheme != None:
+			self.scheme_out = to_scheme.upper()
+
+		carry_over = [] # pieces not yet followed by newline
+		carry_over_len = 0
+
+		for chunk in lines:
+
+			carry_over.append(chunk)
+			carry_over_len += len(chunk)
+
+			if '\n' not in chunk or carry_over_len < stream_chunk_size:
+				continue
+
+			buffer = ''.join(carry_over)
+			cut = buffer.rfind('\n') + 1
+			carry_over = [ buffer[cut:] ]
+			carry_over_len = len(carry_over[0])
+
+			# transliterate() also fixes self.scheme_in once detected
+			yield self.transliterate(buffer[:cut])
+
+		buffer = ''.join(carry_over)
+		if buffer != '':
+			yield self.transliterate(buffer)
@@ -1,16 +1,21 @@
 # set up regex components
 from skrutable import phonemes
-vowels = ''.join(phonemes.SLP_vowels)
-unvoiced_consonants = ''.join(phonemes.SLP_unvoiced_consonants)
-unvoiced_consonants_subset = ['k','K','t','T','p','P','s']
-voiced_consonants = ''.join(phonemes.SLP_voiced_consonants)
+vowels = phonemes.chars_with_flag(phonemes.flag_vowel)
+unvoiced_consonants = phonemes.chars_with_flag(phonemes.flag_unvoiced_consonant)
+unvoiced_consonants_subset = ''.join(['k','K','t','T','p','P','s'])
+voiced_consonants = phonemes.chars_with_flag(phonemes.flag_voiced_consonant)
 
 """The following regexes aim at avoiding virāma and space,
 especially in Indic scripts.
 
 All are replaced by '\1\2', thereby simply removing the space.
+Each must have the form '(X) (Y)', with X and Y matching single characters,
+so that the whole list can be compiled into a single pass
+(see transliteration.compile_virAma_avoidance).
 
 This list is by no means fixed or exhaustive and is meant to be customized.
+Note that it is compiled once on import; after editing it at runtime,
+call transliteration.rebuild_compiled_rules() for changes to take effect.
 """
 
 replacements = [
@@ -32,7 +37,6 @@ replacements = [
 # these spaces are more common and very much depend on the scribe or editor
 '([gqb]) ([%s])' % vowels,
 '(d) ([%s])' % vowels,
-'(t) ([%s])' % unvoiced_consonants_subset, # because e.g. t + ś >> c ch
 '(n) ([%s])' % vowels,
 '(n) ([%s])' % voiced_consonants,
 '(m) ([%s])' % vowels,
@@ -42,4 +46,7 @@ replacements = [
 replacements_more = [
 # this space is sometimes removed by some modern scholars
 "([Aeo]) (')",
+# not in effect so far (subset once interpolated as list, so never matched)
+# would change output, e.g. tat tvam asi >> तत्त्वमसि
+'(t) ([%s])' % unvoiced_consonants_subset, # because e.g. t + ś >> c ch
 ]